@@ -38,6 +38,8 @@ def run_client(server_address, server_port, action, mode, nlu_engine, recording_
             print("Version:", status_result.version)
             print("Status:", status_result.status)
             print("Wake Word:", status_result.wake_word)
+            for component in status_result.components:
+                print(f"Component {component.name}: {component.state}" + (f" ({component.error})" if component.error else ""))
 
         elif action == 'DetectWakeWord':
             stub = voice_agent_pb2_grpc.VoiceAgentServiceStub(channel)
@@ -71,14 +73,9 @@ def run_client(server_address, server_port, action, mode, nlu_engine, recording_
                     print("Wake word detected: ", wake_word_detected)
                     if wake_word_detected:
                         print("[+] Wake Word detected! Recording voice command...")
-                        record_start_request = voice_agent_pb2.RecognizeVoiceControl(action=voice_agent_pb2.START, nlu_model=nlu_engine, record_mode=voice_agent_pb2.MANUAL, stt_framework=stt_framework,online_mode=online_mode,)
-                        response = stub.RecognizeVoiceCommand(iter([record_start_request]))
-                        stream_id = response.stream_id
-
-                        time.sleep(recording_time) # pause here for the number of seconds passed by user or default 5 seconds
-
-                        record_stop_request = voice_agent_pb2.RecognizeVoiceControl(action=voice_agent_pb2.STOP, nlu_model=nlu_engine, record_mode=voice_agent_pb2.MANUAL, stream_id=stream_id,stt_framework=stt_framework,online_mode=online_mode,)
-                        record_result = stub.RecognizeVoiceCommand(iter([record_stop_request]))
+                        # In auto mode the server stops recording on its own once the end of speech is detected
+                        record_start_request = voice_agent_pb2.RecognizeVoiceControl(action=voice_agent_pb2.START, nlu_model=nlu_engine, record_mode=voice_agent_pb2.AUTO, stt_framework=stt_framework,online_mode=online_mode,)
+                        record_result = stub.RecognizeVoiceCommand(iter([record_start_request]))
                         print("[+] Voice command recording ended!")
 
                         status = "Uh oh! Status is unknown."
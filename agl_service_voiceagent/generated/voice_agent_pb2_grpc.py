@@ -64,16 +64,31 @@ class VoiceAgentServiceStub(object):
                 request_serializer=voice__agent__pb2.RecognizeVoiceControl.SerializeToString,
                 response_deserializer=voice__agent__pb2.RecognizeResult.FromString,
                 _registered_method=True)
+        self.S_StreamRecognizeVoiceCommand = channel.stream_stream(
+                '/VoiceAgentService/S_StreamRecognizeVoiceCommand',
+                request_serializer=voice__agent__pb2.S_RecognizeVoiceControl.SerializeToString,
+                response_deserializer=voice__agent__pb2.RecognizeResult.FromString,
+                _registered_method=True)
         self.RecognizeTextCommand = channel.unary_unary(
                 '/VoiceAgentService/RecognizeTextCommand',
                 request_serializer=voice__agent__pb2.RecognizeTextControl.SerializeToString,
                 response_deserializer=voice__agent__pb2.RecognizeResult.FromString,
                 _registered_method=True)
+        self.S_RecognizeTextCommand = channel.stream_stream(
+                '/VoiceAgentService/S_RecognizeTextCommand',
+                request_serializer=voice__agent__pb2.RecognizeTextControl.SerializeToString,
+                response_deserializer=voice__agent__pb2.RecognizeResult.FromString,
+                _registered_method=True)
         self.ExecuteCommand = channel.unary_unary(
                 '/VoiceAgentService/ExecuteCommand',
                 request_serializer=voice__agent__pb2.ExecuteInput.SerializeToString,
                 response_deserializer=voice__agent__pb2.ExecuteResult.FromString,
                 _registered_method=True)
+        self.S_VoiceAssistant = channel.stream_stream(
+                '/VoiceAgentService/S_VoiceAssistant',
+                request_serializer=voice__agent__pb2.VoiceAssistantControl.SerializeToString,
+                response_deserializer=voice__agent__pb2.VoiceAssistantEvent.FromString,
+                _registered_method=True)
 
 
 class VoiceAgentServiceServicer(object):
@@ -111,18 +126,39 @@ class VoiceAgentServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def S_StreamRecognizeVoiceCommand(self, request_iterator, context):
+        """Like S_RecognizeVoiceCommand, but also streams back partial transcripts with the REC_PROCESSING status
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def RecognizeTextCommand(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def S_RecognizeTextCommand(self, request_iterator, context):
+        """Batch version of RecognizeTextCommand, streams back a result for every command in order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ExecuteCommand(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def S_VoiceAssistant(self, request_iterator, context):
+        """Wake word, command recognition, NLU and optional execution on a single audio stream from the client
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_VoiceAgentServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -151,16 +187,31 @@ def add_VoiceAgentServiceServicer_to_server(servicer, server):
                     request_deserializer=voice__agent__pb2.RecognizeVoiceControl.FromString,
                     response_serializer=voice__agent__pb2.RecognizeResult.SerializeToString,
             ),
+            'S_StreamRecognizeVoiceCommand': grpc.stream_stream_rpc_method_handler(
+                    servicer.S_StreamRecognizeVoiceCommand,
+                    request_deserializer=voice__agent__pb2.S_RecognizeVoiceControl.FromString,
+                    response_serializer=voice__agent__pb2.RecognizeResult.SerializeToString,
+            ),
             'RecognizeTextCommand': grpc.unary_unary_rpc_method_handler(
                     servicer.RecognizeTextCommand,
                     request_deserializer=voice__agent__pb2.RecognizeTextControl.FromString,
                     response_serializer=voice__agent__pb2.RecognizeResult.SerializeToString,
             ),
+            'S_RecognizeTextCommand': grpc.stream_stream_rpc_method_handler(
+                    servicer.S_RecognizeTextCommand,
+                    request_deserializer=voice__agent__pb2.RecognizeTextControl.FromString,
+                    response_serializer=voice__agent__pb2.RecognizeResult.SerializeToString,
+            ),
             'ExecuteCommand': grpc.unary_unary_rpc_method_handler(
                     servicer.ExecuteCommand,
                     request_deserializer=voice__agent__pb2.ExecuteInput.FromString,
                     response_serializer=voice__agent__pb2.ExecuteResult.SerializeToString,
             ),
+            'S_VoiceAssistant': grpc.stream_stream_rpc_method_handler(
+                    servicer.S_VoiceAssistant,
+                    request_deserializer=voice__agent__pb2.VoiceAssistantControl.FromString,
+                    response_serializer=voice__agent__pb2.VoiceAssistantEvent.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'VoiceAgentService', rpc_method_handlers)
@@ -307,6 +358,33 @@ class VoiceAgentService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def S_StreamRecognizeVoiceCommand(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/VoiceAgentService/S_StreamRecognizeVoiceCommand',
+            voice__agent__pb2.S_RecognizeVoiceControl.SerializeToString,
+            voice__agent__pb2.RecognizeResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def RecognizeTextCommand(request,
             target,
@@ -334,6 +412,33 @@ class VoiceAgentService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def S_RecognizeTextCommand(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/VoiceAgentService/S_RecognizeTextCommand',
+            voice__agent__pb2.RecognizeTextControl.SerializeToString,
+            voice__agent__pb2.RecognizeResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ExecuteCommand(request,
             target,
@@ -360,3 +465,30 @@ class VoiceAgentService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def S_VoiceAssistant(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/VoiceAgentService/S_VoiceAssistant',
+            voice__agent__pb2.VoiceAssistantControl.SerializeToString,
+            voice__agent__pb2.VoiceAssistantEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+import threading
+from collections import OrderedDict
+
+
+class NLUCache:
+    """
+    NLUCache is a bounded LRU cache of NLU parse results, keyed by the preprocessed text of a command. Entries can also
+    expire after a time to live. The cache is bound to the model that produced its results and is cleared when the
+    model path changes.
+    """
+
+    def __init__(self, max_size=256, ttl=0):
+        """
+        Initialize the NLUCache instance.
+
+        Args:
+            max_size (int, optional): The maximum number of cached results, the least recently used one is evicted
+                once it is reached (default is 256).
+            ttl (float, optional): The time in seconds after which a cached result expires, 0 means results never
+                expire (default is 0).
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.model_path = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def check_model_path(self, model_path):
+        """
+        Clear the cache if its results were produced by a different model. Must be called with the lock held.
+
+        Args:
+            model_path (str): The path of the model the caller is using.
+        """
+        if model_path != self.model_path:
+            self.entries.clear()
+            self.model_path = model_path
+
+    def get(self, model_path, text):
+        """
+        Get the cached parse result of a text.
+
+        Args:
+            model_path (str): The path of the model the caller is using.
+            text (str): The preprocessed text.
+
+        Returns:
+            dict: The cached parse result, or None if the text isn't cached or its result has expired. The result is
+            shared between callers and must not be modified.
+        """
+        with self.lock:
+            self.check_model_path(model_path)
+            entry = self.entries.get(text)
+            if entry is not None and self.ttl and time.monotonic() - entry[1] > self.ttl:
+                del self.entries[text]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(text)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, model_path, text, result):
+        """
+        Cache the parse result of a text.
+
+        Args:
+            model_path (str): The path of the model that produced the result.
+            text (str): The preprocessed text.
+            result (dict): The parse result.
+        """
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.check_model_path(model_path)
+            self.entries[text] = (result, time.monotonic())
+            self.entries.move_to_end(text)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all the cached results.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self):
+        """
+        Get the hit and miss counters of the cache.
+
+        Returns:
+            dict: The number of hits, misses and currently cached results.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -16,16 +16,22 @@
 
 import re
 import time
+import asyncio
+import threading
 import requests
 import subprocess
 from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from agl_service_voiceagent.utils.circuit_breaker import CircuitBreaker
 
 class RASAInterface:
     """
     RASAInterface is a class for interfacing with a Rasa NLU server to extract intents and entities from text input.
     """
 
-    def __init__(self, port, model_path, log_dir, max_threads=5):
+    def __init__(self, port, model_path, log_dir, max_threads=5, cache=None, connect_timeout=2, read_timeout=5, max_retries=2,
+                 failure_threshold=5, reset_timeout=30):
         """
         Initialize the RASAInterface instance with the provided parameters.
 
@@ -34,13 +40,43 @@ class RASAInterface:
             model_path (str): The path to the Rasa NLU model.
             log_dir (str): The directory where server logs will be saved.
             max_threads (int, optional): The maximum number of concurrent threads (default is 5).
+            cache (NLUCache, optional): The cache of parse results to use, parse results aren't cached if None (default is None).
+            connect_timeout (float, optional): The timeout in seconds for connecting to the Rasa NLU server (default is 2).
+            read_timeout (float, optional): The timeout in seconds for the Rasa NLU server to answer (default is 5).
+            max_retries (int, optional): The maximum number of retries of a parse request that failed to connect or got
+                a 50x response (default is 2).
+            failure_threshold (int, optional): The number of consecutive failed parse requests after which requests fail
+                fast without contacting the server (default is 5).
+            reset_timeout (float, optional): The time in seconds after which a request is sent to the server again once
+                requests fail fast (default is 30).
         """
         self.port = port
         self.model_path = model_path
+        self.cache = cache
         self.max_threads = max_threads
         self.server_process = None
         self.thread_pool = ThreadPoolExecutor(max_workers=max_threads)
         self.log_file = log_dir+"rasa_server.log"
+        self.parse_url = f"http://localhost:{self.port}/model/parse"
+        self.status_url = f"http://localhost:{self.port}/status"
+        self.ready = threading.Event()
+        self.ready_time = None
+        self.timeout = (connect_timeout, read_timeout)
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        # A single keep-alive session is shared by all parse requests, its connection pool is sized for the thread pool.
+        # Only connection errors and 50x responses are retried, a read timeout means the server is hung and fails at once.
+        retry = Retry(
+            total=max_retries,
+            read=0,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_threads, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
 
 
     def _start_server(self):
@@ -56,14 +92,70 @@ class RASAInterface:
             self.server_process.wait()  # Wait for the server process to finish
 
 
-    def start_server(self):
+    def start_server(self, timeout=120):
         """
-        Start the Rasa NLU server in a separate thread and wait for it to initialize.
+        Start the Rasa NLU server in a separate thread and wait for it to load its model.
+
+        Args:
+            timeout (float, optional): The maximum time in seconds to wait for the server, None waits until it is
+                ready or exits (default is 120).
+
+        Returns:
+            bool: True if the server is ready, False otherwise.
         """
-        self.thread_pool.submit(self._start_server)
+        # the server gets its own thread, the thread pool is kept for the parse requests
+        threading.Thread(target=self._start_server, daemon=True).start()
+        return self.wait_until_ready(timeout)
 
-        # Wait for a brief moment to allow the server to start
-        time.sleep(25)
+
+    def is_server_ready(self):
+        """
+        Check whether the Rasa NLU server is up and has loaded its model.
+
+        Returns:
+            bool: True if the server is ready, False otherwise.
+        """
+        try:
+            response = requests.get(self.status_url, timeout=self.timeout)
+            return response.status_code == 200 and bool(response.json().get("model_file"))
+        except (requests.RequestException, ValueError):
+            return False
+
+
+    def wait_until_ready(self, timeout=120, initial_interval=0.1, max_interval=2):
+        """
+        Poll the status endpoint of the Rasa NLU server with exponential backoff until it has loaded its model. Once it
+        has, the ready event is set and the time it took is stored in ready_time.
+
+        Args:
+            timeout (float, optional): The maximum time in seconds to wait, None waits until the server is ready or
+                exits (default is 120).
+            initial_interval (float, optional): The time in seconds between the first polls (default is 0.1).
+            max_interval (float, optional): The maximum time in seconds between polls (default is 2).
+
+        Returns:
+            bool: True if the server is ready, False if it exited or the timeout expired.
+        """
+        start_time = time.monotonic()
+        interval = initial_interval
+        while True:
+            if self.is_server_ready():
+                self.ready_time = time.monotonic() - start_time
+                self.ready.set()
+                return True
+
+            if self.server_process is not None and self.server_process.poll() is not None:
+                print(f"[-] Rasa NLU server exited with code {self.server_process.returncode} before it was ready.")
+                return False
+
+            sleep_time = interval
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - start_time)
+                if remaining <= 0:
+                    return False
+                sleep_time = min(interval, remaining)
+            time.sleep(sleep_time)
+            interval = min(interval * 2, max_interval)
 
 
     def stop_server(self):
@@ -74,7 +166,9 @@ class RASAInterface:
             self.server_process.terminate()
             self.server_process.wait()
             self.server_process = None
+            self.ready.clear()
             self.thread_pool.shutdown(wait=True)
+        self.session.close()
     
 
     def preprocess_text(self, text):
@@ -96,16 +190,82 @@ class RASAInterface:
 
 
     def extract_intent(self, text):
+        """
+        Extract the intent and entities of a text using the Rasa NLU server.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            dict: The intent extraction result as a dictionary, or None if the server failed to parse the text.
+        """
         preprocessed_text = self.preprocess_text(text)
-        url = f"http://localhost:{self.port}/model/parse"
+        if self.cache is not None:
+            result = self.cache.get(self.model_path, preprocessed_text)
+            if result is not None:
+                return result
+
+        # fail fast while the server is known to be down
+        if not self.circuit_breaker.allow_request():
+            return None
+
         data = {
             "text": preprocessed_text
         }
-        response = requests.post(url, json=data)
+        try:
+            response = self.session.post(self.parse_url, json=data, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"[-] Rasa parse request failed: {e}")
+            self.circuit_breaker.record_failure()
+            return None
+
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+            return None
+
         if response.status_code == 200:
-            return response.json()
+            try:
+                result = response.json()
+            except ValueError as e:
+                print(f"[-] Rasa returned an invalid parse response: {e}")
+                self.circuit_breaker.record_failure()
+                return None
+            self.circuit_breaker.record_success()
+            # failed parses are never cached, so they are retried on the next request
+            if self.cache is not None:
+                self.cache.put(self.model_path, preprocessed_text, result)
+            return result
         else:
+            self.circuit_breaker.record_success()
             return None
+
+
+    async def extract_intent_async(self, text):
+        """
+        Extract the intent and entities of a text from an asyncio caller. The request runs on the thread pool, so the
+        event loop isn't blocked.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            dict: The intent extraction result as a dictionary, or None if the server failed to parse the text.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.thread_pool, self.extract_intent, text)
+
+
+    def extract_intents(self, texts):
+        """
+        Extract the intents and entities of several texts, sending the parse requests concurrently on the thread pool.
+
+        Args:
+            texts (list): The input texts.
+
+        Returns:
+            list: The intent extraction results in the order of the texts, None for every text the server failed to parse.
+        """
+        return list(self.thread_pool.map(self.extract_intent, texts))
     
 
     def process_intent(self, intent_output):
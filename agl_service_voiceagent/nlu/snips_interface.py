@@ -15,21 +15,35 @@
 # limitations under the License.
 import re
 from typing import Text
+from concurrent.futures.process import BrokenProcessPool
 from snips_inference_agl import SnipsNLUEngine
+from agl_service_voiceagent.nlu.snips_process_pool import SnipsProcessPool
 
 class SnipsInterface:
     """
     SnipsInterface is a class for interacting with the Snips Natural Language Understanding Engine (Snips NLU).
     """
 
-    def __init__(self, model_path: Text):
+    def __init__(self, model_path: Text, cache=None, process_workers=None, start_method="forkserver"):
         """
         Initialize the SnipsInterface instance with the provided Snips NLU model.
 
         Args:
             model_path (Text): The path to the Snips NLU model.
+            cache (NLUCache, optional): The cache of parse results to use, parse results aren't cached if None (default is None).
+            process_workers (int, optional): If set, texts are parsed in a pool of this many worker processes instead of
+                in the calling thread, 0 uses one worker per CPU (default is None).
+            start_method (str, optional): The multiprocessing start method of the worker processes. With 'fork' they are
+                forked once the model is loaded and share its memory, which is only safe if no other thread is running
+                yet (default is 'forkserver').
         """
+        self.model_path = model_path
+        self.cache = cache
         self.engine = SnipsNLUEngine.from_path(model_path)
+        self.process_pool = None
+        if process_workers is not None:
+            self.process_pool = SnipsProcessPool(model_path, process_workers or None, start_method, self.engine)
+            self.process_pool.warm_up()
 
     def preprocess_text(self, text):
         """
@@ -63,9 +77,64 @@ class SnipsInterface:
             dict: The intent extraction result as a dictionary.
         """
         preprocessed_text = self.preprocess_text(text)
-        result = self.engine.parse(preprocessed_text)
+        if self.cache is not None:
+            result = self.cache.get(self.model_path, preprocessed_text)
+            if result is not None:
+                return result
+
+        result = None
+        if self.process_pool is not None:
+            try:
+                result = self.process_pool.parse([preprocessed_text])[0]
+            except BrokenProcessPool as e:
+                # The pool restarts its workers for the next request
+                print(f"[-] Error: Snips worker process pool is broken, parsing in process: {e}")
+        if result is None:
+            result = self.engine.parse(preprocessed_text)
+
+        if self.cache is not None:
+            self.cache.put(self.model_path, preprocessed_text, result)
         return result
-    
+
+    def extract_intents(self, texts, process_pool=None):
+        """
+        Extract the intents of several texts. The texts that aren't cached are parsed concurrently in a pool of worker
+        processes, or in the calling thread if there is none or it is broken.
+
+        Args:
+            texts (list): The input texts.
+            process_pool (SnipsProcessPool, optional): The worker processes to parse in (default is the process pool of
+                the interface).
+
+        Returns:
+            list: The intent extraction results as dictionaries, in the order of the texts.
+        """
+        preprocessed_texts = [self.preprocess_text(text) for text in texts]
+        results = {}
+        missing_texts = []
+        for text in dict.fromkeys(preprocessed_texts):
+            result = self.cache.get(self.model_path, text) if self.cache is not None else None
+            if result is None:
+                missing_texts.append(text)
+            else:
+                results[text] = result
+
+        process_pool = process_pool or self.process_pool
+        parsed = None
+        if missing_texts and process_pool is not None:
+            try:
+                parsed = process_pool.parse(missing_texts)
+            except BrokenProcessPool as e:
+                print(f"[-] Error: Snips worker process pool is broken, parsing in process: {e}")
+        if parsed is None:
+            parsed = [self.engine.parse(text) for text in missing_texts]
+
+        for text, result in zip(missing_texts, parsed):
+            results[text] = result
+            if self.cache is not None:
+                self.cache.put(self.model_path, text, result)
+        return [results[text] for text in preprocessed_texts]
+
     def process_intent(self, intent_output):
         """
         Extract intent and slot values from Snips NLU output.
@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from snips_inference_agl import SnipsNLUEngine
+
+# The Snips NLU engine of a worker process, loaded once by the pool initializer
+worker_engine = None
+
+
+def init_worker(model_path):
+    """
+    Load the Snips NLU model in a worker process, unless the worker was forked with the model already loaded.
+
+    Args:
+        model_path (str): The path to the Snips NLU model.
+    """
+    global worker_engine
+    if worker_engine is None:
+        worker_engine = SnipsNLUEngine.from_path(model_path)
+
+
+def get_worker_pid():
+    """
+    Get the process ID of the worker process. Used to start the workers and wait until they have loaded the model.
+
+    Returns:
+        int: The process ID.
+    """
+    return os.getpid()
+
+
+def parse_texts(texts):
+    """
+    Parse texts with the Snips NLU engine of the worker process.
+
+    Args:
+        texts (list): The preprocessed texts.
+
+    Returns:
+        list: The intent extraction results as dictionaries, in the order of the texts.
+    """
+    return [worker_engine.parse(text) for text in texts]
+
+
+class SnipsProcessPool:
+    """
+    SnipsProcessPool parses texts with the Snips NLU engine in a pool of worker processes. Snips parsing is CPU-bound
+    Python code, running it in separate processes lets it scale with the number of cores instead of being limited by
+    the GIL. Every worker process loads the model once when it starts. With the 'fork' start method and an already
+    loaded engine, the workers are forked after the model is loaded and share its memory pages copy-on-write instead.
+    Forking a process that runs other threads can deadlock the workers on locks held by those threads, so 'fork' must
+    only be used before any other thread is started.
+
+    If a worker process dies, the pool is broken: the parse fails with BrokenProcessPool and the worker processes are
+    started again for the next one.
+    """
+
+    def __init__(self, model_path, max_workers=None, start_method="spawn", engine=None):
+        """
+        Initialize the SnipsProcessPool instance.
+
+        Args:
+            model_path (str): The path to the Snips NLU model.
+            max_workers (int, optional): The number of worker processes (default is None, which uses the number of CPUs).
+            start_method (str, optional): The multiprocessing start method of the worker processes (default is 'spawn').
+            engine (SnipsNLUEngine, optional): An engine with the model already loaded, inherited by the workers when
+                the start method is 'fork' (default is None).
+        """
+        global worker_engine
+        self.model_path = model_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.start_method = start_method
+        if engine is not None and start_method == "fork":
+            worker_engine = engine
+        self.lock = threading.Lock()
+        self.executor = self.create_executor()
+
+    def create_executor(self):
+        """
+        Create the executor running the worker processes.
+
+        Returns:
+            ProcessPoolExecutor: The executor.
+        """
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=init_worker,
+            initargs=(self.model_path,),
+        )
+
+    def restart(self, executor):
+        """
+        Replace a broken executor with new worker processes, unless it was already replaced. Other threads are running
+        by now, so workers are started with 'forkserver' instead of 'fork'.
+
+        Args:
+            executor (ProcessPoolExecutor): The broken executor.
+        """
+        with self.lock:
+            if self.executor is not executor:
+                return
+            if self.start_method == "fork":
+                self.start_method = "forkserver"
+            self.executor = self.create_executor()
+        executor.shutdown(wait=False)
+
+    def warm_up(self):
+        """
+        Start the worker processes and wait until they have loaded the model, so the first requests don't pay for it.
+
+        Returns:
+            int: The number of distinct worker processes that answered.
+        """
+        futures = [self.executor.submit(get_worker_pid) for _ in range(self.max_workers)]
+        return len({future.result() for future in futures})
+
+    def parse(self, texts, chunk_size=None):
+        """
+        Parse texts concurrently across the worker processes.
+
+        Args:
+            texts (list): The preprocessed texts.
+            chunk_size (int, optional): The number of texts sent to a worker at once (default is None, which splits the
+                texts evenly across the workers).
+
+        Returns:
+            list: The intent extraction results as dictionaries, in the order of the texts.
+
+        Raises:
+            BrokenProcessPool: If a worker process died, the worker processes are restarted for the next parse.
+        """
+        if not texts:
+            return []
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(texts) // self.max_workers))
+
+        executor = self.executor
+        try:
+            futures = [
+                executor.submit(parse_texts, texts[i:i + chunk_size])
+                for i in range(0, len(texts), chunk_size)
+            ]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+        except BrokenProcessPool:
+            self.restart(executor)
+            raise
+        return results
+
+    def shutdown(self):
+        """
+        Shut down the worker processes.
+        """
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import threading
+
+
+class SpeculativeNLU:
+    """
+    SpeculativeNLU runs intent extraction on the partial transcript of a command while the user is still speaking.
+    Once the partial transcript has been stable for a while, the NLU runs on it in the background and its result is
+    cached by the normalized text. When the final transcript matches, the cached result is returned right away, so most
+    of the NLU latency is hidden behind the speech.
+    """
+
+    def __init__(self, extract_intent, executor, stability_ms=300):
+        """
+        Initialize the SpeculativeNLU instance.
+
+        Args:
+            extract_intent (callable): Extracts the intent of a text, its result is what gets cached.
+            executor (concurrent.futures.Executor): The executor the speculative extractions run on.
+            stability_ms (int, optional): How long in milliseconds the partial transcript must stay unchanged before
+                the NLU runs on it (default is 300).
+        """
+        self.extract_intent = extract_intent
+        self.executor = executor
+        self.stability_ms = stability_ms
+        self.results = {}
+        self.current_text = ""
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def normalize_text(self, text):
+        """
+        Normalize a transcript so that hypotheses differing only in case, punctuation or spacing share a result.
+
+        Args:
+            text (str): The transcript to normalize.
+
+        Returns:
+            str: The normalized transcript.
+        """
+        text = re.sub(r'[^\w\s]', '', text.lower())
+        return " ".join(text.split())
+
+    def update(self, partial_text):
+        """
+        Report a new partial transcript. The NLU runs on it once it stays unchanged for the stability period.
+
+        Args:
+            partial_text (str): The current partial transcript.
+        """
+        normalized_text = self.normalize_text(partial_text)
+        with self.lock:
+            if normalized_text == self.current_text:
+                return
+            self.current_text = normalized_text
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = None
+            if normalized_text and normalized_text not in self.results:
+                self.timer = threading.Timer(self.stability_ms / 1000, self.speculate, [normalized_text])
+                self.timer.daemon = True
+                self.timer.start()
+
+    def speculate(self, normalized_text):
+        """
+        Start the extraction for a partial transcript if it is still the current one.
+
+        Args:
+            normalized_text (str): The normalized partial transcript.
+        """
+        with self.lock:
+            if normalized_text != self.current_text or normalized_text in self.results:
+                return
+            self.results[normalized_text] = self.executor.submit(self.extract_intent, normalized_text)
+
+    def get_result(self, text):
+        """
+        Get the NLU result for the final transcript, reusing the speculative result when the transcript matches one
+        whose extraction has started. An extraction still queued behind other requests is not waited for.
+
+        Args:
+            text (str): The final transcript.
+
+        Returns:
+            tuple: The NLU result, and True if it came from a speculative extraction.
+        """
+        self.cancel()
+        normalized_text = self.normalize_text(text)
+        with self.lock:
+            future = self.results.get(normalized_text)
+        if future is not None and not future.cancelled():
+            return future.result(), True
+        return self.extract_intent(text), False
+
+    def cancel(self):
+        """
+        Cancel the pending speculative extraction and the extractions that haven't started on the executor yet.
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            futures = list(self.results.values())
+        for future in futures:
+            future.cancel()
@@ -16,6 +16,8 @@
 
 import sys
 sys.path.append("../")
+import time
+import signal
 import grpc
 from concurrent import futures
 from agl_service_voiceagent.generated import voice_agent_pb2_grpc
@@ -23,18 +25,27 @@ from agl_service_voiceagent.servicers.voice_agent_servicer import VoiceAgentServ
 from agl_service_voiceagent.utils.config import get_config_value, get_logger
 
 def run_server():
+    start_time = time.monotonic()
     logger = get_logger()
     SERVER_URL = get_config_value('SERVER_ADDRESS') + ":" + str(get_config_value('SERVER_PORT'))
     print("Starting Voice Agent Service...")
     print(f"VOSK Model Path: {get_config_value('VOSK_MODEL_PATH')}")
     print(f"WHISPER Model Path: {get_config_value('WHISPER_MODEL_PATH')}")
     print(f"Audio Store Directory: {get_config_value('BASE_AUDIO_DIR')}")
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    voice_agent_pb2_grpc.add_VoiceAgentServiceServicer_to_server(VoiceAgentServicer(), server)
+    max_workers = int(get_config_value('SERVER_MAX_WORKERS', fallback='10'))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    servicer = VoiceAgentServicer()
+    voice_agent_pb2_grpc.add_VoiceAgentServiceServicer_to_server(servicer, server)
     server.add_insecure_port(SERVER_URL)
     print("Press Ctrl+C to stop the server.")
     print("Voice Agent Server started!")
     print(f"Server running at URL: {SERVER_URL}")
-    logger.info(f"Voice Agent Service started in server mode! Server running at URL: {SERVER_URL}")
+    # stop the server on SIGTERM too, so that the background processes are cleaned up below
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop(None))
     server.start()
-    server.wait_for_termination()
\ No newline at end of file
+    # the engines keep loading in the background, CheckServiceStatus reports when each of them is ready
+    logger.info(f"Voice Agent Service started in server mode in {time.monotonic() - start_time:.2f} seconds! Server running at URL: {SERVER_URL}")
+    try:
+        server.wait_for_termination()
+    finally:
+        servicer.shutdown()
\ No newline at end of file
@@ -153,6 +153,8 @@ def main():
             
             # Convert to an absolute path if it's a relative path
             vosk_path = add_trailing_slash(os.path.abspath(vosk_path)) if not os.path.isabs(vosk_path) else vosk_path
+            ww_model_path = args.ww_model_path or vosk_path
+            ww_model_path = add_trailing_slash(os.path.abspath(ww_model_path)) if not os.path.isabs(ww_model_path) else ww_model_path
             whisper_path = add_trailing_slash(os.path.abspath(whisper_path)) if not os.path.isabs(whisper_path) else whisper_path
             snips_model_path = add_trailing_slash(os.path.abspath(snips_model_path)) if not os.path.isabs(snips_model_path) else snips_model_path
             rasa_model_path = add_trailing_slash(os.path.abspath(rasa_model_path)) if not os.path.isabs(rasa_model_path) else rasa_model_path
@@ -161,6 +163,7 @@ def main():
             
             # Also update the config.ini file
             update_config_value(vosk_path, 'VOSK_MODEL_PATH')
+            update_config_value(ww_model_path, 'WAKE_WORD_MODEL_PATH')
             update_config_value(whisper_path, 'WHISPER_MODEL_PATH')
             update_config_value(snips_model_path, 'SNIPS_MODEL_PATH')
             update_config_value(rasa_model_path, 'RASA_MODEL_PATH')
@@ -20,17 +20,27 @@ import json
 import time
 import threading
 import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from agl_service_voiceagent.generated import voice_agent_pb2
 from agl_service_voiceagent.generated import voice_agent_pb2_grpc
 from agl_service_voiceagent.utils.audio_recorder import AudioRecorder
 from agl_service_voiceagent.utils.wake_word import WakeWordDetector
+from agl_service_voiceagent.utils.capture_pipeline import CapturePipelinePool
 from agl_service_voiceagent.utils.stt_model import STTModel
+from agl_service_voiceagent.utils.whisper_worker import WhisperCppWorker
+from agl_service_voiceagent.utils.vad import EnergyVAD, VADEndpointer
 from agl_service_voiceagent.utils.kuksa_interface import KuksaInterface
 from agl_service_voiceagent.utils.mapper import Intent2VSSMapper
 from agl_service_voiceagent.utils.config import get_config_value, get_logger
 from agl_service_voiceagent.utils.common import generate_unique_uuid, delete_file
+from agl_service_voiceagent.utils.component_registry import ComponentRegistry, Component
 from agl_service_voiceagent.nlu.snips_interface import SnipsInterface
 from agl_service_voiceagent.nlu.rasa_interface import RASAInterface
+from agl_service_voiceagent.nlu.nlu_cache import NLUCache
+from agl_service_voiceagent.nlu.speculative_nlu import SpeculativeNLU
+from agl_service_voiceagent.nlu.snips_process_pool import SnipsProcessPool
+from agl_service_voiceagent.utils.stage_timer import StageTimer
 from agl_service_voiceagent.utils.stt_online_service import STTOnlineService
 from agl_service_voiceagent.utils.vss_interface import VSSInterface
 from kuksa_client.grpc import Datapoint
@@ -59,14 +69,54 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         self.rasa_model_path = get_config_value('RASA_MODEL_PATH')
         self.rasa_server_port = int(get_config_value('RASA_SERVER_PORT'))
         self.rasa_detached_mode = bool(int(get_config_value('RASA_DETACHED_MODE')))
+        self.rasa_startup_timeout = float(get_config_value('RASA_STARTUP_TIMEOUT', fallback='120'))
         self.base_log_dir = get_config_value('BASE_LOG_DIR')
         self.store_voice_command = bool(int(get_config_value('STORE_VOICE_COMMANDS')))
+        self.wake_word_keepalive_interval = float(get_config_value('WAKE_WORD_KEEPALIVE_INTERVAL', fallback='5'))
+        self.wake_word_detection_mode = get_config_value('WAKE_WORD_DETECTION_MODE', fallback='endpoint')
+        self.wake_word_hop_size = int(get_config_value('WAKE_WORD_HOP_SIZE', fallback='200'))
+        self.wake_word_grammar_mode = bool(int(get_config_value('WAKE_WORD_GRAMMAR_MODE', fallback='0')))
+        self.wake_word_vad = bool(int(get_config_value('WAKE_WORD_VAD', fallback='0')))
+        self.vad_threshold = float(get_config_value('VAD_THRESHOLD', fallback='-45'))
+        self.vad_hangover = int(get_config_value('VAD_HANGOVER', fallback='300'))
+        self.vad_silence_duration = int(get_config_value('VAD_SILENCE_DURATION', fallback='800'))
+        self.vad_no_speech_timeout = int(get_config_value('VAD_NO_SPEECH_TIMEOUT', fallback='5000'))
+        self.vad_max_recording_time = int(get_config_value('VAD_MAX_RECORDING_TIME', fallback='10000'))
+        self.recording_finalize_timeout = 2
+        self.capture_pipeline_pool = bool(int(get_config_value('CAPTURE_PIPELINE_POOL', fallback='0')))
+        self.capture_preroll = int(get_config_value('CAPTURE_PREROLL', fallback='500'))
+        self.capture_source = get_config_value('CAPTURE_SOURCE', fallback='alsasrc')
+        self.capture_handoff_timeout = 5
+        self.speculative_nlu = bool(int(get_config_value('SPECULATIVE_NLU', fallback='0')))
+        self.speculative_nlu_stability = int(get_config_value('SPECULATIVE_NLU_STABILITY', fallback='300'))
+        self.nlu_cache_size = int(get_config_value('NLU_CACHE_SIZE', fallback='0'))
+        self.nlu_cache_ttl = float(get_config_value('NLU_CACHE_TTL', fallback='0'))
+        self.nlu_batch_size = int(get_config_value('NLU_BATCH_SIZE', fallback='64'))
+        self.nlu_batch_workers = int(get_config_value('NLU_BATCH_WORKERS', fallback='0'))
+        self.snips_process_pool = bool(int(get_config_value('SNIPS_PROCESS_POOL', fallback='0')))
+        self.snips_process_workers = int(get_config_value('SNIPS_PROCESS_WORKERS', fallback='0'))
+        self.snips_process_start_method = get_config_value('SNIPS_PROCESS_START_METHOD', fallback='forkserver')
+        self.server_max_workers = int(get_config_value('SERVER_MAX_WORKERS', fallback='10'))
+        self.recognizer_idle_timeout = float(get_config_value('RECOGNIZER_IDLE_TIMEOUT', fallback='300'))
         self.logger = get_logger()
 
         # load the whisper model_path
         self.whisper_model_path = get_config_value('WHISPER_MODEL_PATH')
         self.whisper_cpp_path = get_config_value('WHISPER_CPP_PATH')
         self.whisper_cpp_model_path = get_config_value('WHISPER_CPP_MODEL_PATH')
+        self.whisper_cpp_worker_enabled = bool(int(get_config_value('WHISPER_CPP_WORKER', fallback='0')))
+        self.whisper_cpp_server_path = get_config_value('WHISPER_CPP_SERVER_PATH', fallback='/usr/bin/whisper-server')
+        self.whisper_cpp_server_port = int(get_config_value('WHISPER_CPP_SERVER_PORT', fallback='51055'))
+        self.whisper_timeout = float(get_config_value('WHISPER_TIMEOUT', fallback='10'))
+        self.whisper_strategy = get_config_value('WHISPER_STRATEGY', fallback='fallback')
+
+        # The whisper.cpp worker loads its model once and is reused for every utterance. It is started in the
+        # background, until it is ready whisper requests fall back to spawning the whisper.cpp CLI.
+        self.whisper_worker = None
+        if self.whisper_cpp_worker_enabled:
+            self.whisper_worker = WhisperCppWorker(self.whisper_cpp_server_path, self.whisper_cpp_model_path, self.whisper_cpp_server_port, job_timeout=self.whisper_timeout)
+            self.logger.info(f"Starting whisper.cpp worker at URL: 127.0.0.1:{self.whisper_cpp_server_port}")
+            threading.Thread(target=self.whisper_worker.start, daemon=True).start()
 
         # loading values for online mode
         self.online_mode = bool(int(get_config_value('ONLINE_MODE')))
@@ -79,40 +129,172 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
             
 
         # Initialize class methods
-        self.logger.info("Loading Speech to Text and Wake Word Model...")
-        self.stt_model = STTModel(self.vosk_model_path, self.whisper_model_path,self.whisper_cpp_path,self.whisper_cpp_model_path,self.sample_rate)
-        self.stt_wake_word_model = STTModel(self.vosk_model_path, self.whisper_model_path,self.whisper_cpp_path,self.whisper_cpp_model_path,self.sample_rate)
-        self.logger.info("Speech to Text and Wake Word Model loaded successfully.")
-
-        self.logger.info("Starting SNIPS intent engine...")
-        self.snips_interface = SnipsInterface(self.snips_model_path)
-        self.logger.info("SNIPS intent engine started successfully!")
-
-        self.rasa_interface = RASAInterface(self.rasa_server_port, self.rasa_model_path, self.base_log_dir)
-
-        # Only start RASA server if its not in detached mode, else we assume server is already running
+        # The engines are loaded in stages so that the gRPC server can come up right away: independent components are
+        # loaded in parallel in the background and rarely used ones only on first use. Requests that need a component
+        # wait until it is loaded.
+        # Both STT models are backed by the process-wide Vosk model registry, so they share the same model in memory
+        # when the wake word model path is the same as the speech to text model path
+        self.components = ComponentRegistry()
+        self.components.register("stt_model", lambda: STTModel(self.vosk_model_path, self.whisper_model_path,self.whisper_cpp_path,self.whisper_cpp_model_path,self.sample_rate,self.server_max_workers,self.recognizer_idle_timeout,self.whisper_worker,self.whisper_timeout,self.whisper_strategy))
+        self.components.register("wake_word_model", lambda: STTModel(self.wake_word_model_path, self.whisper_model_path,self.whisper_cpp_path,self.whisper_cpp_model_path,self.sample_rate,self.server_max_workers,self.recognizer_idle_timeout))
+        # Parse results of repeated commands are served from a cache instead of running the NLU again
+        self.snips_cache = NLUCache(self.nlu_cache_size, self.nlu_cache_ttl) if self.nlu_cache_size > 0 else None
+        self.rasa_cache = NLUCache(self.nlu_cache_size, self.nlu_cache_ttl) if self.nlu_cache_size > 0 else None
+        # With the SNIPS process pool enabled every SNIPS request is parsed in a worker process, away from the GIL
+        snips_process_workers = self.snips_process_workers if self.snips_process_pool else None
+        if self.snips_process_pool and self.snips_process_start_method == "fork":
+            self.logger.warning("SNIPS worker processes are forked while other threads of the service are running, they may deadlock. Use the 'forkserver' or 'spawn' start method instead.")
+        self.components.register("snips", lambda: SnipsInterface(self.snips_model_path, self.snips_cache, snips_process_workers, self.snips_process_start_method))
+        self.components.register("mapper", Intent2VSSMapper)
+        self.components.register("media_controller", MediaController, lazy=True)
+        # Batch text recognition parses SNIPS commands in a pool of worker processes, started on the first batch unless
+        # the SNIPS process pool already runs one
+        self.components.register("snips_pool", lambda: self.snips_interface.process_pool or SnipsProcessPool(self.snips_model_path, self.nlu_batch_workers or None), lazy=True)
+        self.components.start()
+
+        self.rasa_interface = RASAInterface(self.rasa_server_port, self.rasa_model_path, self.base_log_dir, cache=self.rasa_cache)
+        # Speculative intent extractions run in the background while the user is still speaking
+        self.nlu_executor = ThreadPoolExecutor(max_workers=2)
+
+        # Only start RASA server if its not in detached mode, else we assume server is already running. Either way the
+        # server's readiness is probed in the background, RASA requests are served by SNIPS until it is ready.
         if not self.rasa_detached_mode:
             self.logger.info(f"Starting RASA intent engine server as a subprocess...")
-            self.rasa_interface.start_server()
-            self.logger.info(f"RASA intent engine server started successfully! RASA server running at URL: 127.0.0.1:{self.rasa_server_port}")
         
         else:
             self.logger.info(f"RASA intent engine detached mode detected! Assuming RASA server is running at URL: 127.0.0.1:{self.rasa_server_port}")
+        threading.Thread(target=self.wait_for_rasa_server, args=(not self.rasa_detached_mode,), daemon=True).start()
 
         self.rvc_stream_uuids = {}
 
-        self.logger.info(f"Loading and parsing mapping files...")
-        self.mapper = Intent2VSSMapper()
-        self.logger.info(f"Successfully loaded and parsed mapping files.")
-
-        # Media controller
-        self.media_controller = MediaController()
+        # A single capture pipeline is built once and kept running, wake word detection and command recording both
+        # consume its audio. Its history only covers the pre-roll, a recording following a wake word starts from the
+        # subscription handed over by the detector.
+        self.capture_pool = None
+        self.wake_word_handoffs = {}
+        self.handoff_lock = threading.Lock()
+        if self.capture_pipeline_pool:
+            self.capture_pool = CapturePipelinePool(self.capture_preroll)
+            threading.Thread(target=self.get_capture_pipeline, daemon=True).start()
 
         self.vss_interface = VSSInterface()
         self.vss_thread = threading.Thread(target=self.start_vss_client)
         self.vss_thread.start()
         self.vss_event_loop = None
         
+    def shutdown(self):
+        """
+        Stop the background processes started by the service.
+        """
+        if self.whisper_worker is not None:
+            self.logger.info("Stopping whisper.cpp worker...")
+            self.whisper_worker.stop()
+        if self.capture_pool is not None:
+            self.logger.info("Stopping shared capture pipelines...")
+            with self.handoff_lock:
+                handoffs, self.wake_word_handoffs = self.wake_word_handoffs, {}
+            for _, _, timer in handoffs.values():
+                timer.cancel()
+            self.capture_pool.stop()
+        if self.components.is_ready("snips") and self.snips_interface.process_pool is not None:
+            self.logger.info("Stopping SNIPS worker processes...")
+            self.snips_interface.process_pool.shutdown()
+        # The batch pool is only started on the first batch, and can be the process pool of the SNIPS interface
+        if self.components.is_ready("snips_pool") and self.snips_pool is not self.snips_interface.process_pool:
+            self.logger.info("Stopping SNIPS batch worker processes...")
+            self.snips_pool.shutdown()
+
+    # Components loaded in the background
+
+    @property
+    def stt_model(self):
+        """
+        STTModel: The speech to text model, waits until it is loaded.
+        """
+        return self.components.get("stt_model")
+
+    @property
+    def stt_wake_word_model(self):
+        """
+        STTModel: The wake word model, waits until it is loaded.
+        """
+        return self.components.get("wake_word_model")
+
+    @property
+    def snips_interface(self):
+        """
+        SnipsInterface: The SNIPS intent engine, waits until it is loaded.
+        """
+        return self.components.get("snips")
+
+    @property
+    def mapper(self):
+        """
+        Intent2VSSMapper: The intent to VSS mapper, waits until the mapping files are loaded.
+        """
+        return self.components.get("mapper")
+
+    @property
+    def media_controller(self):
+        """
+        MediaController: The media controller, connected to MPD on first use.
+        """
+        return self.components.get("media_controller")
+
+    @property
+    def snips_pool(self):
+        """
+        SnipsProcessPool: The pool of SNIPS worker processes, started on first use.
+        """
+        return self.components.get("snips_pool")
+
+    def get_nlu_cache_stats(self):
+        """
+        Get the hit and miss counters of the NLU caches.
+
+        Returns:
+            dict: The counters of the cache of every NLU engine, empty if the NLU cache is disabled.
+        """
+        stats = {}
+        if self.snips_cache is not None:
+            stats["snips"] = self.snips_cache.get_stats()
+        if self.rasa_cache is not None:
+            stats["rasa"] = self.rasa_cache.get_stats()
+        return stats
+
+    def get_component_statuses(self):
+        """
+        Get the readiness of the components of the service, including the ones started outside the component registry.
+
+        Returns:
+            list: A ComponentStatus message per component.
+        """
+        statuses = [
+            voice_agent_pb2.ComponentStatus(
+                name=status["name"],
+                ready=status["state"] == Component.READY,
+                state=status["state"],
+                load_time=status["load_time"] or 0.0,
+                error=status["error"] or "",
+            )
+            for status in self.components.get_status()
+        ]
+
+        rasa_ready = self.rasa_interface.ready.is_set()
+        statuses.append(voice_agent_pb2.ComponentStatus(
+            name="rasa",
+            ready=rasa_ready,
+            state=Component.READY if rasa_ready else Component.LOADING,
+            load_time=self.rasa_interface.ready_time or 0.0,
+        ))
+        if self.whisper_worker is not None:
+            statuses.append(voice_agent_pb2.ComponentStatus(
+                name="whisper_worker",
+                ready=self.whisper_worker.ready,
+                state=Component.READY if self.whisper_worker.ready else Component.LOADING,
+            ))
+        return statuses
+
     # VSS client methods
 
     def start_vss_client(self):
@@ -186,6 +368,358 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         )
         return future.result()
 
+    def get_capture_pipeline(self):
+        """
+        Get the shared capture pipeline, creating and starting it on first use.
+
+        Returns:
+            CapturePipeline: The shared capture pipeline, or None if the capture pipeline pool is disabled.
+        """
+        if self.capture_pool is None:
+            return None
+        return self.capture_pool.get_pipeline(self.capture_source, self.channels, self.sample_rate, self.bits_per_sample)
+
+    def set_wake_word_handoff(self, client, capture_pipeline, subscription):
+        """
+        Keep the capture subscription handed over by the wake word detector of a client, so the next command recording
+        of the same client starts exactly where the wake word ended. Handoffs are keyed by the peer of the client, a
+        client using a separate channel for the recording can't claim its handoff and gets the pre-roll instead. An
+        unclaimed handoff is released after `capture_handoff_timeout` seconds.
+
+        Args:
+            client (str): The peer of the client.
+            capture_pipeline (CapturePipeline): The shared capture pipeline.
+            subscription (CaptureSubscription): The subscription starting at the end of the wake word.
+        """
+        timer = threading.Timer(self.capture_handoff_timeout, self.release_wake_word_handoff, args=(client, subscription))
+        timer.daemon = True
+        with self.handoff_lock:
+            previous = self.wake_word_handoffs.get(client)
+            self.wake_word_handoffs[client] = (capture_pipeline, subscription, timer)
+        if previous is not None:
+            previous[2].cancel()
+            previous[0].unsubscribe(previous[1])
+        timer.start()
+
+    def release_wake_word_handoff(self, client, subscription):
+        """
+        Release the capture subscription handed over to a client if it is still unclaimed.
+
+        Args:
+            client (str): The peer of the client.
+            subscription (CaptureSubscription): The subscription to release.
+        """
+        with self.handoff_lock:
+            handoff = self.wake_word_handoffs.get(client)
+            if handoff is None or handoff[1] is not subscription:
+                return
+            del self.wake_word_handoffs[client]
+        handoff[0].unsubscribe(subscription)
+
+    def take_wake_word_handoff(self, client):
+        """
+        Claim the capture subscription handed over to a client by its last wake word detection.
+
+        Args:
+            client (str): The peer of the client.
+
+        Returns:
+            CaptureSubscription: The subscription, or None if there is no pending handoff for the client.
+        """
+        with self.handoff_lock:
+            handoff = self.wake_word_handoffs.pop(client, None)
+        if handoff is None:
+            return None
+        handoff[2].cancel()
+        return handoff[1]
+
+    def create_wake_word_detector(self, sample_rate=None, local_capture=False):
+        """
+        Create a wake word detector configured from the service config.
+
+        Args:
+            sample_rate (int, optional): The sample rate of the audio to process (default is the configured sample rate).
+            local_capture (bool, optional): If True, the detector listens to the microphone of the server, through the
+                pooled capture pipeline when the pool is enabled (default is False).
+
+        Returns:
+            WakeWordDetector: The wake word detector.
+        """
+        capture_pipeline = self.get_capture_pipeline() if local_capture else None
+        vad = EnergyVAD(self.vad_threshold, self.vad_hangover) if self.wake_word_vad else None
+        return WakeWordDetector(
+            self.wake_word,
+            self.stt_wake_word_model,
+            self.channels,
+            sample_rate or self.sample_rate,
+            self.bits_per_sample,
+            detection_mode=self.wake_word_detection_mode,
+            hop_size_ms=self.wake_word_hop_size,
+            grammar_mode=self.wake_word_grammar_mode,
+            vad=vad,
+            capture_pipeline=capture_pipeline,
+            capture_handoff=local_capture
+        )
+
+    def create_recorder(self, mode, in_memory=False, client=None):
+        """
+        Create an audio recorder configured from the service config.
+
+        Args:
+            mode (str): The recording mode ('auto' or 'manual').
+            in_memory (bool, optional): If True, the audio is captured in memory and only written to a file if voice
+                commands are stored (default is False).
+            client (str, optional): The peer of the client, whose pending wake word handoff is used to start the
+                recording where the wake word ended (default is None).
+
+        Returns:
+            AudioRecorder: The audio recorder.
+        """
+        endpointer = VADEndpointer(self.vad_threshold, self.vad_silence_duration, self.vad_no_speech_timeout, self.vad_max_recording_time)
+        capture_mode = "memory" if in_memory else "file"
+        capture_pipeline = self.get_capture_pipeline()
+        capture_start_position = None
+        capture_subscription = None
+        if capture_pipeline is not None:
+            capture_subscription = self.take_wake_word_handoff(client)
+            if capture_subscription is None:
+                capture_start_position = capture_pipeline.get_position_before(self.capture_preroll)
+        recorder = AudioRecorder(self.stt_model, self.base_audio_dir, self.channels, self.sample_rate, self.bits_per_sample, endpointer=endpointer, capture_mode=capture_mode, store_audio=self.store_voice_command, capture_pipeline=capture_pipeline, capture_start_position=capture_start_position, capture_subscription=capture_subscription)
+        recorder.set_pipeline_mode(mode)
+        return recorder
+
+    def start_capture_recognition(self, recorder, stt_framework):
+        """
+        Start decoding the audio of an in-memory recorder in a background thread, so that the transcript is ready
+        shortly after the recording stops.
+
+        Args:
+            recorder (AudioRecorder): The recorder in 'memory' capture mode.
+            stt_framework (str): The STT framework to use ('vosk' or 'whisper').
+
+        Returns:
+            tuple: The recognition thread (threading.Thread) and the dict its transcript is stored in.
+        """
+        result = {}
+        recognizer_uuid = self.stt_model.setup_vosk_recognizer()
+
+        def recognize():
+            try:
+                result["stt"] = self.stt_model.recognize_from_stream(recognizer_uuid, recorder.get_audio_chunks(), stt_framework=stt_framework)
+            finally:
+                self.stt_model.cleanup_recognizer(recognizer_uuid)
+
+        recognition_thread = threading.Thread(target=recognize)
+        recognition_thread.start()
+        return recognition_thread, result
+
+    def finish_capture_recognition(self, recognition_thread, result, nlu_model):
+        """
+        Wait for the background recognition of an in-memory recording and extract the intent of the transcript.
+
+        Args:
+            recognition_thread (threading.Thread): The thread returned by `start_capture_recognition`.
+            result (dict): The dict returned by `start_capture_recognition`.
+            nlu_model (NLUModel): The NLU model to use for intent extraction.
+
+        Returns:
+            tuple: The recognized text (str), the intent name (str), a list of IntentSlot messages, a list of slot dicts
+            for logging and the RecognizeStatusType of the recognition.
+        """
+        recognition_thread.join()
+        stt = result.get("stt", "")
+
+        if stt not in ["VOICE_NOT_RECOGNIZED", ""]:
+            intent, intent_slots, log_intent_slots, status = self.recognize_intent(stt, nlu_model)
+
+        else:
+            return "", "", [], [], voice_agent_pb2.VOICE_NOT_RECOGNIZED
+
+        return stt, intent, intent_slots, log_intent_slots, status
+
+    def recognize_recorded_command(self, audio_file, stt_framework, use_online_mode, nlu_model):
+        """
+        Recognize a voice command recorded on the server side and extract its intent. The audio file is deleted
+        afterwards unless voice commands are stored.
+
+        Args:
+            audio_file (str): The path to the recorded audio file.
+            stt_framework (str): The STT framework to use ('vosk' or 'whisper').
+            use_online_mode (bool): Whether the client requested the online STT service.
+            nlu_model (NLUModel): The NLU model to use for intent extraction.
+
+        Returns:
+            tuple: The recognized text (str), the intent name (str), a list of IntentSlot messages, a list of slot dicts
+            for logging and the RecognizeStatusType of the recognition.
+        """
+        intent = ""
+        intent_slots = []
+        log_intent_slots = []
+        used_kaldi = False
+
+        if use_online_mode and self.online_mode:
+            print("Recognizing voice command using online mode.")
+            if self.stt_online.initialized:
+                stt = self.stt_online.recognize_audio(audio_file=audio_file)
+            elif not self.stt_online.initialized:
+                self.stt_online.initialize_connection()
+                stt = self.stt_online.recognize_audio(audio_file=audio_file)
+        else:
+            recognizer_uuid = self.stt_model.setup_vosk_recognizer()
+            stt = self.stt_model.recognize_from_file(recognizer_uuid, audio_file,stt_framework=stt_framework)
+            used_kaldi = True
+
+        if use_online_mode and self.online_mode and stt is None:
+            print("Online mode enabled but failed to recognize voice command. Switching to offline mode.")
+            recognizer_uuid = self.stt_model.setup_vosk_recognizer()
+            stt = self.stt_model.recognize_from_file(recognizer_uuid, audio_file,stt_framework=stt_framework)
+            used_kaldi = True
+        print(stt)
+        if stt not in ["FILE_NOT_FOUND", "FILE_FORMAT_INVALID", "VOICE_NOT_RECOGNIZED", ""]:
+            intent, intent_slots, log_intent_slots, status = self.recognize_intent(stt, nlu_model)
+
+        else:
+            stt = ""
+            status = voice_agent_pb2.VOICE_NOT_RECOGNIZED
+
+        # cleanup the kaldi recognizer
+        if used_kaldi:
+            self.stt_model.cleanup_recognizer(recognizer_uuid)
+
+        # delete the audio file
+        if not self.store_voice_command:
+            delete_file(audio_file)
+
+        return stt, intent, intent_slots, log_intent_slots, status
+
+    def wait_for_rasa_server(self, start_server):
+        """
+        Wait for the RASA server to load its model and log how long it took.
+
+        Args:
+            start_server (bool): Whether to start the RASA server as a subprocess first.
+        """
+        start_time = time.monotonic()
+        if start_server:
+            ready = self.rasa_interface.start_server(self.rasa_startup_timeout)
+        else:
+            ready = self.rasa_interface.wait_until_ready(self.rasa_startup_timeout)
+
+        if not ready and (self.rasa_interface.server_process is None or self.rasa_interface.server_process.poll() is None):
+            self.logger.warning(f"RASA intent engine server is not ready after {self.rasa_startup_timeout} seconds, RASA requests are served by SNIPS until it is.")
+            ready = self.rasa_interface.wait_until_ready(None)
+
+        if ready:
+            self.logger.info(f"RASA intent engine server ready in {time.monotonic() - start_time:.2f} seconds! RASA server running at URL: 127.0.0.1:{self.rasa_server_port}")
+        else:
+            self.logger.error("RASA intent engine server exited before it was ready, RASA requests are served by SNIPS.")
+
+    def create_speculative_nlu(self, nlu_model):
+        """
+        Create a speculative NLU runner for a request if speculative NLU is enabled.
+
+        Args:
+            nlu_model (NLUModel): The NLU model to use for intent extraction.
+
+        Returns:
+            SpeculativeNLU: The speculative NLU runner, or None if speculative NLU is disabled.
+        """
+        if not self.speculative_nlu:
+            return None
+        return SpeculativeNLU(lambda text: self.recognize_intent(text, nlu_model), self.nlu_executor, self.speculative_nlu_stability)
+
+    def recognize_final_intent(self, text, nlu_model, speculative_nlu=None):
+        """
+        Extract the intent of a final transcript, reusing the result of the speculative NLU when it matches.
+
+        Args:
+            text (str): The final transcript.
+            nlu_model (NLUModel): The NLU model to use for intent extraction.
+            speculative_nlu (SpeculativeNLU, optional): The speculative NLU runner of the request (default is None).
+
+        Returns:
+            tuple: The intent name (str), a list of IntentSlot messages, a list of slot dicts for logging, the
+            RecognizeStatusType of the extraction and True if the speculative result was used.
+        """
+        if speculative_nlu is None:
+            return (*self.recognize_intent(text, nlu_model), False)
+        result, speculative_hit = speculative_nlu.get_result(text)
+        return (*result, speculative_hit)
+
+    def get_nlu_interface(self, nlu_model):
+        """
+        Get the interface of the requested NLU model. RASA requests are served by SNIPS until the RASA server is ready.
+
+        Args:
+            nlu_model (NLUModel): The NLU model to use for intent extraction.
+
+        Returns:
+            SnipsInterface or RASAInterface: The NLU interface, or None if the NLU model is not supported.
+        """
+        if nlu_model == voice_agent_pb2.SNIPS:
+            return self.snips_interface
+        elif nlu_model == voice_agent_pb2.RASA:
+            if not self.rasa_interface.ready.is_set():
+                self.logger.info("RASA intent engine server is not ready yet, falling back to SNIPS.")
+                return self.snips_interface
+            return self.rasa_interface
+        return None
+
+    def recognize_intent(self, text, nlu_model):
+        """
+        Extract the intent and its slots from a text command using the requested NLU model.
+
+        Args:
+            text (str): The text command to process.
+            nlu_model (NLUModel): The NLU model to use for intent extraction.
+
+        Returns:
+            tuple: The intent name (str), a list of IntentSlot messages, a list of slot dicts for logging and the
+            RecognizeStatusType of the extraction.
+        """
+        nlu_interface = self.get_nlu_interface(nlu_model)
+        if nlu_interface is None:
+            return "", [], [], voice_agent_pb2.NLU_MODEL_NOT_SUPPORTED
+
+        extracted_intent = nlu_interface.extract_intent(text)
+        return self.process_extracted_intent(text, nlu_interface, extracted_intent)
+
+    def process_extracted_intent(self, text, nlu_interface, extracted_intent):
+        """
+        Turn the output of an NLU engine into the intent and its slots.
+
+        Args:
+            text (str): The text command the output was extracted from.
+            nlu_interface (SnipsInterface or RASAInterface): The NLU interface that extracted the intent.
+            extracted_intent (dict): The intent extraction result, None if the NLU engine failed to parse the text.
+
+        Returns:
+            tuple: The intent name (str), a list of IntentSlot messages, a list of slot dicts for logging and the
+            RecognizeStatusType of the extraction.
+        """
+        intent = ""
+        intent_slots = []
+        log_intent_slots = []
+        status = voice_agent_pb2.REC_SUCCESS
+
+        if extracted_intent is None:
+            self.logger.error(f"NLU engine failed to parse the command: {text}")
+            return intent, intent_slots, log_intent_slots, voice_agent_pb2.REC_ERROR
+
+        intent, intent_actions = nlu_interface.process_intent(extracted_intent)
+
+        if not intent or intent == "":
+            intent = ""
+            status = voice_agent_pb2.INTENT_NOT_RECOGNIZED
+
+        else:
+            for action, value in intent_actions.items():
+                intent_slots.append(voice_agent_pb2.IntentSlot(name=action, value=value))
+                log_intent_slots.append({"name": action, "value": value})
+
+        return intent, intent_slots, log_intent_slots, status
+
+
     def CheckServiceStatus(self, request, context):
         """
         Check the status of the Voice Agent service including the version.
@@ -195,10 +729,12 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         client_ip = context.peer()
         self.logger.info(f"[ReqID#{request_id}] Client {client_ip} made a request to CheckServiceStatus end-point.")
 
+        components = self.get_component_statuses()
         response = voice_agent_pb2.ServiceStatus(
             version=self.service_version,
             status=True,
             wake_word=self.wake_word,
+            components=components,
         )
 
         # Convert the response object to a JSON string and log it
@@ -206,6 +742,8 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
             "version": self.service_version,
             "status": True,
             "wake_word": self.wake_word,
+            "components": {component.name: component.state for component in components},
+            "nlu_cache": self.get_nlu_cache_stats(),
         }
         response_json = json.dumps(response_data)
         self.logger.info(f"[ReqID#{request_id}] Returning response to client {client_ip} from CheckServiceStatus end-point. Response: {response_json}")
@@ -213,6 +751,36 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         return response
 
 
+    def S_DetectWakeWord(self, requests, context):
+        """
+        Detect the wake word in audio streamed by the client. Audio chunks are expected to be raw mono 16-bit PCM and are
+        processed as soon as they arrive, without a server side recording pipeline. A positive status is returned the
+        moment the wake word is detected, a negative one if the client closes the stream before that.
+        """
+        # Log the unique request ID, client's IP address, and the endpoint
+        request_id = generate_unique_uuid(8)
+        client_ip = context.peer()
+        self.logger.info(f"[ReqID#{request_id}] Client {client_ip} made a request to S_DetectWakeWord end-point.")
+
+        wake_word_detector = None
+        status = False
+        try:
+            for request in requests:
+                if wake_word_detector is None:
+                    wake_word_detector = self.create_wake_word_detector(request.sample_rate)
+
+                if wake_word_detector.feed_audio(request.audio_chunk):
+                    status = True
+                    break
+
+        finally:
+            if wake_word_detector is not None:
+                wake_word_detector.cleanup_recognizer()
+
+        self.logger.info(f"[ReqID#{request_id}] Returning wake word status '{status}' to client {client_ip} from S_DetectWakeWord end-point.")
+        yield voice_agent_pb2.WakeWordStatus(status=status)
+
+
     def DetectWakeWord(self, request, context):
         """
         Detect the wake word using the wake word detection model. This method records voice on server side. If your client 
@@ -223,27 +791,32 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         client_ip = context.peer()
         self.logger.info(f"[ReqID#{request_id}] Client {client_ip} made a request to DetectWakeWord end-point.")
 
-        wake_word_detector = WakeWordDetector(self.wake_word, self.stt_model, self.channels, self.sample_rate, self.bits_per_sample)
+        wake_word_detector = self.create_wake_word_detector(local_capture=True)
         wake_word_detector.create_pipeline()
         detection_thread = threading.Thread(target=wake_word_detector.start_listening)
         detection_thread.start()
-        x = 0
+
+        # Stop listening as soon as the client goes away instead of waiting for the next keepalive
+        context.add_callback(wake_word_detector.send_eos)
+
         while True:
-            status = wake_word_detector.get_wake_word_status()
-            time.sleep(0.5)
-            x += 1
-            print(x)
-            # if(x>=6):
-            #     status = True
-            #     wake_word_detector.send_eos()
-            # if x ==-1:
-            #     status = True
-            if not context.is_active():
+            # Block until the detector reports the wake word, only waking up periodically to send a keepalive
+            status = wake_word_detector.wait_for_wake_word(timeout=self.wake_word_keepalive_interval)
+            if status:
+                self.logger.info(f"[ReqID#{request_id}] Wake word detected for client {client_ip}.")
+                # The handoff subscription is created by the detection thread right before it exits
+                detection_thread.join()
+                handoff_subscription = wake_word_detector.get_handoff_subscription()
+                if handoff_subscription is not None:
+                    self.set_wake_word_handoff(client_ip, wake_word_detector.capture_pipeline, handoff_subscription)
+                yield voice_agent_pb2.WakeWordStatus(status=status)
+                break
+
+            if not context.is_active() or wake_word_detector.stopped:
                 wake_word_detector.send_eos()
                 break
+
             yield voice_agent_pb2.WakeWordStatus(status=status)
-            if status:
-                break
 
         detection_thread.join()
     
@@ -253,6 +826,9 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         Recognize the voice command using the STT model and extract the intent using the NLU model. This method records voice 
         on server side, meaning the client only sends a START and STOP request to the server. If your client and server are 
         not on the same machine, then you should use the `S_RecognizeVoiceCommand` method instead.
+
+        With the AUDIO_MEMORY transport, the audio is captured in memory and decoded while it is being recorded, and it
+        is only written to disk if voice commands are stored.
         """
         stt = ""
         intent = ""
@@ -270,6 +846,9 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
             if request.online_mode == voice_agent_pb2.ONLINE:
                 use_online_mode = True
 
+            # The online STT service uploads a recorded file, so it always uses the file transport
+            in_memory = request.audio_transport == voice_agent_pb2.AUDIO_MEMORY and not (use_online_mode and self.online_mode)
+
             if request.record_mode == voice_agent_pb2.MANUAL:
 
                 if request.action == voice_agent_pb2.START:
@@ -280,21 +859,28 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
                     client_ip = context.peer()
                     self.logger.info(f"[ReqID#{stream_uuid}] Client {client_ip} made a manual START request to RecognizeVoiceCommand end-point.")
 
-                    recorder = AudioRecorder(self.stt_model, self.base_audio_dir, self.channels, self.sample_rate, self.bits_per_sample)
-                    recorder.set_pipeline_mode("manual")
+                    recorder = self.create_recorder("manual", in_memory, client_ip)
                     audio_file = recorder.create_pipeline()
 
-                    self.rvc_stream_uuids[stream_uuid] = {
-                        "recorder": recorder,
-                        "audio_file": audio_file
-                    }
-
                     def record():
                         recorder.start_recording()
 
                     record_thread = threading.Thread(target=record)
                     record_thread.start()
 
+                    # In-memory recordings are decoded while the user is still speaking
+                    recognition_thread, recognition_result = None, None
+                    if in_memory:
+                        recognition_thread, recognition_result = self.start_capture_recognition(recorder, stt_framework)
+
+                    self.rvc_stream_uuids[stream_uuid] = {
+                        "recorder": recorder,
+                        "audio_file": audio_file,
+                        "record_thread": record_thread,
+                        "recognition_thread": recognition_thread,
+                        "recognition_result": recognition_result
+                    }
+
                 elif request.action == voice_agent_pb2.STOP:
                     stream_uuid = request.stream_id
                     status = voice_agent_pb2.REC_SUCCESS
@@ -305,70 +891,52 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
 
                     recorder = self.rvc_stream_uuids[stream_uuid]["recorder"]
                     audio_file = self.rvc_stream_uuids[stream_uuid]["audio_file"]
+                    record_thread = self.rvc_stream_uuids[stream_uuid]["record_thread"]
+                    recognition_thread = self.rvc_stream_uuids[stream_uuid]["recognition_thread"]
+                    recognition_result = self.rvc_stream_uuids[stream_uuid]["recognition_result"]
                     del self.rvc_stream_uuids[stream_uuid]
                     print(use_online_mode)
 
                     recorder.stop_recording()
-                                      
-                    used_kaldi = False
-
-                    if use_online_mode and self.online_mode:
-                        print("Recognizing voice command using online mode.")
-                        if self.stt_online.initialized:
-                            stt = self.stt_online.recognize_audio(audio_file=audio_file)
-                        elif not self.stt_online.initialized:
-                            self.stt_online.initialize_connection()
-                            stt = self.stt_online.recognize_audio(audio_file=audio_file)
+                    # Wait for the EOS to reach the sinks so that the WAV file and the in-memory capture are complete
+                    record_thread.join(timeout=self.recording_finalize_timeout)
+
+                    if recognition_thread is not None:
+                        stt, intent, intent_slots, log_intent_slots, status = self.finish_capture_recognition(recognition_thread, recognition_result, request.nlu_model)
                     else:
-                        recognizer_uuid = self.stt_model.setup_vosk_recognizer()
-                        stt = self.stt_model.recognize_from_file(recognizer_uuid, audio_file,stt_framework=stt_framework)
-                        used_kaldi = True
-
-                    if use_online_mode and self.online_mode and stt is None:
-                        print("Online mode enabled but failed to recognize voice command. Switching to offline mode.")
-                        recognizer_uuid = self.stt_model.setup_vosk_recognizer()
-                        stt = self.stt_model.recognize_from_file(recognizer_uuid, audio_file,stt_framework=stt_framework)
-                        used_kaldi = True
-                    print(stt)
-                    if stt not in ["FILE_NOT_FOUND", "FILE_FORMAT_INVALID", "VOICE_NOT_RECOGNIZED", ""]:
-                        if request.nlu_model == voice_agent_pb2.SNIPS:
-                            extracted_intent = self.snips_interface.extract_intent(stt)
-                            intent, intent_actions = self.snips_interface.process_intent(extracted_intent)
-                            if not intent or intent == "":
-                                status = voice_agent_pb2.INTENT_NOT_RECOGNIZED
-                            
-                            else:
-                                for action, value in intent_actions.items():
-                                    intent_slots.append(voice_agent_pb2.IntentSlot(name=action, value=value))
-                                    log_intent_slots.append({"name": action, "value": value})
-                        
-                        elif request.nlu_model == voice_agent_pb2.RASA:
-                            extracted_intent = self.rasa_interface.extract_intent(stt)
-                            intent, intent_actions = self.rasa_interface.process_intent(extracted_intent)
+                        stt, intent, intent_slots, log_intent_slots, status = self.recognize_recorded_command(audio_file, stt_framework, use_online_mode, request.nlu_model)
 
-                            if not intent or intent == "":
-                                status = voice_agent_pb2.INTENT_NOT_RECOGNIZED
+            elif request.record_mode == voice_agent_pb2.AUTO:
 
-                            else:
-                                for action, value in intent_actions.items():
-                                    intent_slots.append(voice_agent_pb2.IntentSlot(name=action, value=value))
-                                    log_intent_slots.append({"name": action, "value": value})
+                if request.action == voice_agent_pb2.START:
+                    stream_uuid = generate_unique_uuid(8)
 
-                        else:
-                            status = voice_agent_pb2.NLU_MODEL_NOT_SUPPORTED
+                    # Log the unique request ID, client's IP address, and the endpoint
+                    client_ip = context.peer()
+                    self.logger.info(f"[ReqID#{stream_uuid}] Client {client_ip} made an auto START request to RecognizeVoiceCommand end-point.")
+
+                    recorder = self.create_recorder("auto", in_memory, client_ip)
+                    audio_file = recorder.create_pipeline()
+
+                    # Stop recording if the client goes away before the end of speech is detected
+                    context.add_callback(recorder.stop_recording)
+
+                    if in_memory:
+                        recognition_thread, recognition_result = self.start_capture_recognition(recorder, stt_framework)
+
+                    # Blocks until the VAD endpointer detects the end of the command and the recording is finalized
+                    recorder.start_recording()
 
+                    if in_memory:
+                        stt, intent, intent_slots, log_intent_slots, status = self.finish_capture_recognition(recognition_thread, recognition_result, request.nlu_model)
                     else:
-                        stt = ""
-                        status = voice_agent_pb2.VOICE_NOT_RECOGNIZED
-                    
-                    # cleanup the kaldi recognizer
-                    if used_kaldi:
-                        self.stt_model.cleanup_recognizer(recognizer_uuid)
-                        used_kaldi = False
+                        stt, intent, intent_slots, log_intent_slots, status = self.recognize_recorded_command(audio_file, stt_framework, use_online_mode, request.nlu_model)
 
-                    # delete the audio file
-                    if not self.store_voice_command:   
-                        delete_file(audio_file)
+                else:
+                    stream_uuid = request.stream_id
+                    client_ip = context.peer()
+                    status = voice_agent_pb2.REC_ERROR
+                    self.logger.error(f"[ReqID#{stream_uuid}] Client {client_ip} sent a STOP request in auto mode, recordings in auto mode end on their own.")
 
 
         # Process the request and generate a RecognizeResult
@@ -394,48 +962,294 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         return response
     
 
-    def RecognizeTextCommand(self, request, context):
+    def S_RecognizeVoiceCommand(self, requests, context):
         """
-        Recognize the text command using the STT model and extract the intent using the NLU model.
+        Recognize the voice command streamed by the client and extract the intent using the NLU model. Every incoming
+        audio chunk is decoded by the Vosk recognizer while the client is still streaming, so the transcript is ready
+        right after the last chunk arrives. Audio chunks are expected to be raw mono 16-bit PCM.
+
+        With whisper, the audio reaches whisper.cpp either through a WAV file (AUDIO_FILE) or straight from memory
+        (AUDIO_MEMORY). A copy of the audio is only persisted if voice commands are stored.
         """
+        stt = ""
         intent = ""
         intent_slots = []
         log_intent_slots = []
 
-        stream_uuid = generate_unique_uuid(8)
-        text_command = request.text_command
-        status = voice_agent_pb2.REC_SUCCESS
+        client_ip = context.peer()
+        requests = iter(requests)
+        first_request = next(requests, None)
+        if first_request is None:
+            self.logger.error(f"Client {client_ip} closed the S_RecognizeVoiceCommand stream without sending any audio.")
+            return voice_agent_pb2.RecognizeResult(status=voice_agent_pb2.VOICE_NOT_RECOGNIZED)
 
         # Log the unique request ID, client's IP address, and the endpoint
+        stream_uuid = first_request.stream_id or generate_unique_uuid(8)
+        self.logger.info(f"[ReqID#{stream_uuid}] Client {client_ip} made a request to S_RecognizeVoiceCommand end-point.")
+
+        stt_framework = 'whisper' if first_request.stt_framework == voice_agent_pb2.WHISPER else 'vosk'
+        in_memory = first_request.audio_transport == voice_agent_pb2.AUDIO_MEMORY
+
+        # The audio is written to disk if whisper reads it from a file, or if a copy has to be stored
+        audio_file = None
+        if (stt_framework == 'whisper' and not in_memory) or self.store_voice_command:
+            audio_file = f"{self.base_audio_dir}{int(time.time())}_{generate_unique_uuid(6)}.wav"
+
+        def audio_chunks():
+            yield first_request.audio_stream.audio_chunk
+            for request in requests:
+                yield request.audio_stream.audio_chunk
+
+        sample_rate = first_request.audio_stream.sample_rate or self.sample_rate
+        recognizer_uuid = self.stt_model.setup_vosk_recognizer(sample_rate)
+        try:
+            stt = self.stt_model.recognize_from_stream(recognizer_uuid, audio_chunks(), stt_framework=stt_framework, sample_rate=sample_rate, in_memory=in_memory, audio_file=audio_file)
+        finally:
+            self.stt_model.cleanup_recognizer(recognizer_uuid)
+            if audio_file is not None and not self.store_voice_command:
+                delete_file(audio_file)
+
+        if stt not in ["VOICE_NOT_RECOGNIZED", ""]:
+            intent, intent_slots, log_intent_slots, status = self.recognize_intent(stt, first_request.nlu_model)
+
+        else:
+            stt = ""
+            status = voice_agent_pb2.VOICE_NOT_RECOGNIZED
+
+        response = voice_agent_pb2.RecognizeResult(
+            command=stt,
+            intent=intent,
+            intent_slots=intent_slots,
+            stream_id=stream_uuid,
+            status=status
+        )
+
+        # Convert the response object to a JSON string and log it
+        response_data = {
+            "command": stt,
+            "intent": intent,
+            "intent_slots": log_intent_slots,
+            "stream_id": stream_uuid,
+            "status": status
+        }
+        response_json = json.dumps(response_data)
+        self.logger.info(f"[ReqID#{stream_uuid}] Returning response to client {client_ip} from S_RecognizeVoiceCommand end-point. Response: {response_json}")
+
+        return response
+
+
+    def S_StreamRecognizeVoiceCommand(self, requests, context):
+        """
+        Recognize the voice command streamed by the client like `S_RecognizeVoiceCommand`, but stream back the
+        transcript while it is decoded. Every change of the hypothesis is sent as a RecognizeResult with the
+        REC_PROCESSING status, so the HMI can show live text. The last RecognizeResult carries the final transcript,
+        its intent and the final status.
+        """
         client_ip = context.peer()
-        self.logger.info(f"[ReqID#{stream_uuid}] Client {client_ip} made a request to RecognizeTextCommand end-point.")
+        requests = iter(requests)
+        first_request = next(requests, None)
+        if first_request is None:
+            self.logger.error(f"Client {client_ip} closed the S_StreamRecognizeVoiceCommand stream without sending any audio.")
+            yield voice_agent_pb2.RecognizeResult(status=voice_agent_pb2.VOICE_NOT_RECOGNIZED)
+            return
 
-        if request.nlu_model == voice_agent_pb2.SNIPS:
-            extracted_intent = self.snips_interface.extract_intent(text_command)
-            intent, intent_actions = self.snips_interface.process_intent(extracted_intent)
+        # Log the unique request ID, client's IP address, and the endpoint
+        stream_uuid = first_request.stream_id or generate_unique_uuid(8)
+        self.logger.info(f"[ReqID#{stream_uuid}] Client {client_ip} made a request to S_StreamRecognizeVoiceCommand end-point.")
+
+        stt_framework = 'whisper' if first_request.stt_framework == voice_agent_pb2.WHISPER else 'vosk'
+        sample_rate = first_request.audio_stream.sample_rate or self.sample_rate
+        audio_chunks = itertools.chain(
+            [first_request.audio_stream.audio_chunk],
+            (request.audio_stream.audio_chunk for request in requests)
+        )
 
-            if not intent or intent == "":
-                status = voice_agent_pb2.INTENT_NOT_RECOGNIZED
-            
-            else:
-                for action, value in intent_actions.items():
-                    intent_slots.append(voice_agent_pb2.IntentSlot(name=action, value=value))
-                    log_intent_slots.append({"name": action, "value": value})
-        
-        elif request.nlu_model == voice_agent_pb2.RASA:
-            extracted_intent = self.rasa_interface.extract_intent(text_command)
-            intent, intent_actions = self.rasa_interface.process_intent(extracted_intent)
+        stage_timer = StageTimer()
+        speculative_nlu = self.create_speculative_nlu(first_request.nlu_model)
+        recognizer_uuid = self.stt_model.setup_vosk_recognizer(sample_rate)
+        stage_timer.start("stt")
+        try:
+            for final, stt in self.stt_model.recognize_stream_with_partials(recognizer_uuid, audio_chunks, sample_rate=sample_rate, stt_framework=stt_framework):
+                if not final:
+                    if speculative_nlu is not None:
+                        speculative_nlu.update(stt)
+                    yield voice_agent_pb2.RecognizeResult(command=stt, stream_id=stream_uuid, status=voice_agent_pb2.REC_PROCESSING)
+
+        finally:
+            self.stt_model.cleanup_recognizer(recognizer_uuid)
+            if speculative_nlu is not None:
+                speculative_nlu.cancel()
+        stage_timer.stop("stt")
 
-            if not intent or intent == "":
-                status = voice_agent_pb2.INTENT_NOT_RECOGNIZED
+        intent = ""
+        intent_slots = []
+        log_intent_slots = []
+        speculative_hit = False
+        if stt not in ["VOICE_NOT_RECOGNIZED", ""]:
+            stage_timer.start("nlu")
+            intent, intent_slots, log_intent_slots, status, speculative_hit = self.recognize_final_intent(stt, first_request.nlu_model, speculative_nlu)
+            stage_timer.stop("nlu")
 
-            else:
-                for action, value in intent_actions.items():
-                    intent_slots.append(voice_agent_pb2.IntentSlot(name=action, value=value))
-                    log_intent_slots.append({"name": action, "value": value})
-        
         else:
-            status = voice_agent_pb2.NLU_MODEL_NOT_SUPPORTED
+            stt = ""
+            status = voice_agent_pb2.VOICE_NOT_RECOGNIZED
+
+        self.logger.info(f"[ReqID#{stream_uuid}] Stage timings: {stage_timer.format_timings()} speculative_nlu_hit={speculative_hit}")
+
+        # Convert the response object to a JSON string and log it
+        response_data = {
+            "command": stt,
+            "intent": intent,
+            "intent_slots": log_intent_slots,
+            "stream_id": stream_uuid,
+            "status": status
+        }
+        response_json = json.dumps(response_data)
+        self.logger.info(f"[ReqID#{stream_uuid}] Returning final response to client {client_ip} from S_StreamRecognizeVoiceCommand end-point. Response: {response_json}")
+
+        yield voice_agent_pb2.RecognizeResult(
+            command=stt,
+            intent=intent,
+            intent_slots=intent_slots,
+            stream_id=stream_uuid,
+            status=status
+        )
+
+    def detect_wake_word_in_stream(self, audio_chunks, sample_rate):
+        """
+        Consume an audio stream until the wake word is detected.
+
+        Args:
+            audio_chunks (iterator): An iterator of raw mono 16-bit PCM audio chunks (bytes).
+            sample_rate (int): The sample rate of the audio.
+
+        Returns:
+            tuple: True if the wake word was detected, False if the stream ended first, and the audio that followed the
+            wake word in the chunks consumed so far (bytes).
+        """
+        wake_word_detector = self.create_wake_word_detector(sample_rate)
+        try:
+            for chunk in audio_chunks:
+                if wake_word_detector.feed_audio(chunk):
+                    # The audio not yet processed by the detector is kept, so the command starts right where the wake
+                    # word ended
+                    return True, wake_word_detector.get_remaining_audio()
+
+        finally:
+            wake_word_detector.cleanup_recognizer()
+
+        return False, b""
+
+    def S_VoiceAssistant(self, requests, context):
+        """
+        Run a whole voice assistant interaction on a single audio stream from the client: detect the wake word, decode
+        the command while it is spoken until the VAD endpointer detects the end of speech, extract its intent and
+        optionally execute it. Events are streamed back as soon as they are available, so the result is ready right
+        after the user stops speaking. Audio chunks are expected to be raw mono 16-bit PCM.
+        """
+        # Log the unique request ID, client's IP address, and the endpoint
+        request_id = generate_unique_uuid(8)
+        client_ip = context.peer()
+        self.logger.info(f"[ReqID#{request_id}] Client {client_ip} made a request to S_VoiceAssistant end-point.")
+
+        requests = iter(requests)
+        first_request = next(requests, None)
+        if first_request is None:
+            self.logger.error(f"[ReqID#{request_id}] Client {client_ip} closed the S_VoiceAssistant stream without sending any audio.")
+            return
+
+        sample_rate = first_request.audio_stream.sample_rate or self.sample_rate
+        audio_chunks = itertools.chain(
+            [first_request.audio_stream.audio_chunk],
+            (request.audio_stream.audio_chunk for request in requests)
+        )
+
+        stage_timer = StageTimer()
+        if not first_request.skip_wake_word:
+            stage_timer.start("wake_word")
+            detected, command_audio = self.detect_wake_word_in_stream(audio_chunks, sample_rate)
+            stage_timer.stop("wake_word")
+            if not detected:
+                self.logger.info(f"[ReqID#{request_id}] Client {client_ip} closed the S_VoiceAssistant stream before the wake word was detected.")
+                return
+
+            self.logger.info(f"[ReqID#{request_id}] Wake word detected for client {client_ip}.")
+            yield voice_agent_pb2.VoiceAssistantEvent(type=voice_agent_pb2.WAKE_WORD_DETECTED)
+            audio_chunks = itertools.chain([command_audio], audio_chunks)
+
+        # Decode the command as it arrives and stop at the end of speech
+        endpointer = VADEndpointer(self.vad_threshold, self.vad_silence_duration, self.vad_no_speech_timeout, self.vad_max_recording_time)
+        speculative_nlu = self.create_speculative_nlu(first_request.nlu_model)
+        recognizer_uuid = self.stt_model.setup_vosk_recognizer(sample_rate)
+        stage_timer.start("stt")
+        try:
+            for final, stt in self.stt_model.recognize_stream_with_partials(recognizer_uuid, audio_chunks, endpointer, sample_rate):
+                if not final:
+                    if speculative_nlu is not None:
+                        speculative_nlu.update(stt)
+                    yield voice_agent_pb2.VoiceAssistantEvent(type=voice_agent_pb2.PARTIAL_TRANSCRIPT, partial_command=stt)
+
+        finally:
+            self.stt_model.cleanup_recognizer(recognizer_uuid)
+            if speculative_nlu is not None:
+                speculative_nlu.cancel()
+        stage_timer.stop("stt")
+
+        if stt == "VOICE_NOT_RECOGNIZED":
+            stt = ""
+
+        intent = ""
+        intent_slots = []
+        log_intent_slots = []
+        speculative_hit = False
+        if stt:
+            stage_timer.start("nlu")
+            intent, intent_slots, log_intent_slots, status, speculative_hit = self.recognize_final_intent(stt, first_request.nlu_model, speculative_nlu)
+            stage_timer.stop("nlu")
+        else:
+            status = voice_agent_pb2.VOICE_NOT_RECOGNIZED
+
+        recognize_result = voice_agent_pb2.RecognizeResult(
+            command=stt,
+            intent=intent,
+            intent_slots=intent_slots,
+            stream_id=request_id,
+            status=status
+        )
+
+        # Convert the response object to a JSON string and log it
+        response_data = {
+            "command": stt,
+            "intent": intent,
+            "intent_slots": log_intent_slots,
+            "stream_id": request_id,
+            "status": status
+        }
+        response_json = json.dumps(response_data)
+        self.logger.info(f"[ReqID#{request_id}] Returning recognition result to client {client_ip} from S_VoiceAssistant end-point. Response: {response_json}")
+        yield voice_agent_pb2.VoiceAssistantEvent(type=voice_agent_pb2.COMMAND_RECOGNIZED, recognize_result=recognize_result)
+
+        if first_request.auto_execute and status == voice_agent_pb2.REC_SUCCESS:
+            stage_timer.start("execute")
+            execute_result = self.ExecuteCommand(voice_agent_pb2.ExecuteInput(intent=intent, intent_slots=intent_slots), context)
+            stage_timer.stop("execute")
+            yield voice_agent_pb2.VoiceAssistantEvent(type=voice_agent_pb2.COMMAND_EXECUTED, execute_result=execute_result)
+
+        self.logger.info(f"[ReqID#{request_id}] Stage timings: {stage_timer.format_timings()} speculative_nlu_hit={speculative_hit}")
+
+
+    def RecognizeTextCommand(self, request, context):
+        """
+        Recognize the text command using the STT model and extract the intent using the NLU model.
+        """
+        stream_uuid = generate_unique_uuid(8)
+        text_command = request.text_command
+
+        # Log the unique request ID, client's IP address, and the endpoint
+        client_ip = context.peer()
+        self.logger.info(f"[ReqID#{stream_uuid}] Client {client_ip} made a request to RecognizeTextCommand end-point.")
+
+        intent, intent_slots, log_intent_slots, status = self.recognize_intent(text_command, request.nlu_model)
 
         # Process the request and generate a RecognizeResult
         response = voice_agent_pb2.RecognizeResult(
@@ -460,6 +1274,90 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
         return response
 
 
+    def recognize_text_batch(self, requests):
+        """
+        Extract the intents of a batch of text commands. Identical commands are only parsed once and cached results are
+        reused, SNIPS commands are parsed concurrently in the SNIPS worker processes and RASA commands concurrently on the
+        RASA client's thread pool.
+
+        Args:
+            requests (list): The RecognizeTextControl messages of the batch.
+
+        Returns:
+            tuple: A list with the intent name (str), a list of IntentSlot messages, a list of slot dicts for logging
+            and the RecognizeStatusType of every command in the order of the requests, and the number of unique commands.
+        """
+        # group the unique preprocessed commands by NLU interface
+        nlu_interfaces = {}
+        keys = []
+        unique_texts = {}
+        for request in requests:
+            if request.nlu_model not in nlu_interfaces:
+                nlu_interfaces[request.nlu_model] = self.get_nlu_interface(request.nlu_model)
+            nlu_interface = nlu_interfaces[request.nlu_model]
+            if nlu_interface is None:
+                keys.append(None)
+                continue
+
+            text = nlu_interface.preprocess_text(request.text_command)
+            keys.append((nlu_interface, text))
+            unique_texts.setdefault(nlu_interface, {})[text] = None
+
+        # RASA commands are sent in the background while the SNIPS commands are parsed
+        parsed = {}
+        rasa_texts = list(unique_texts.get(self.rasa_interface, {}))
+        rasa_future = self.nlu_executor.submit(self.rasa_interface.extract_intents, rasa_texts) if rasa_texts else None
+        snips_texts = list(unique_texts.get(self.snips_interface, {}))
+        if snips_texts:
+            parsed.update(zip(((self.snips_interface, text) for text in snips_texts), self.snips_interface.extract_intents(snips_texts, self.snips_pool)))
+        if rasa_future is not None:
+            parsed.update(zip(((self.rasa_interface, text) for text in rasa_texts), rasa_future.result()))
+
+        results = []
+        for request, key in zip(requests, keys):
+            if key is None:
+                results.append(("", [], [], voice_agent_pb2.NLU_MODEL_NOT_SUPPORTED))
+            else:
+                results.append(self.process_extracted_intent(request.text_command, key[0], parsed[key]))
+        return results, len(parsed)
+
+
+    def S_RecognizeTextCommand(self, requests, context):
+        """
+        Recognize a stream of text commands and extract their intents using the NLU model of every command. Commands are
+        processed in batches of `nlu_batch_size`, a result is streamed back for every command in order.
+        """
+        stream_uuid = generate_unique_uuid(8)
+
+        # Log the unique request ID, client's IP address, and the endpoint
+        client_ip = context.peer()
+        self.logger.info(f"[ReqID#{stream_uuid}] Client {client_ip} made a request to S_RecognizeTextCommand end-point.")
+
+        start_time = time.monotonic()
+        command_count = 0
+        unique_count = 0
+        requests = iter(requests)
+        while True:
+            batch = list(itertools.islice(requests, self.nlu_batch_size))
+            if not batch:
+                break
+
+            results, batch_unique_count = self.recognize_text_batch(batch)
+            command_count += len(batch)
+            unique_count += batch_unique_count
+            for request, (intent, intent_slots, log_intent_slots, status) in zip(batch, results):
+                yield voice_agent_pb2.RecognizeResult(
+                    command=request.text_command,
+                    intent=intent,
+                    intent_slots=intent_slots,
+                    stream_id=stream_uuid,
+                    status=status
+                )
+
+        elapsed = time.monotonic() - start_time
+        self.logger.info(f"[ReqID#{stream_uuid}] Returned {command_count} results ({unique_count} unique commands parsed) to client {client_ip} from S_RecognizeTextCommand end-point in {elapsed:.2f} seconds. NLU cache: {json.dumps(self.get_nlu_cache_stats())}")
+
+
     def ExecuteCommand(self, request, context):
         """
         Execute the voice command by sending the intent to Kuksa.
@@ -484,12 +1382,22 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
 
         # Check for the media control intents
         if intent == "MediaControl":
+            try:
+                media_controller = self.media_controller
+            except RuntimeError as e:
+                # The media controller is loaded again on a later request
+                self.logger.error(f"[ReqID#{request_id}] Media controller is not available: {e}")
+                return voice_agent_pb2.ExecuteResult(
+                    response="Uh oh, I failed to connect to the media player.",
+                    status=voice_agent_pb2.EXEC_ERROR
+                )
+
             for slot in processed_slots:
                 if slot["name"] == "media_control_action":
                     action = slot["value"]
                     
             if action == "resume" or action == "play":
-                if self.media_controller.resume():
+                if media_controller.resume():
                     exec_response = "Yay, I successfully resumed the media."
                     exec_status = voice_agent_pb2.EXEC_SUCCESS
                 else:
@@ -497,7 +1405,7 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
                     exec_status = voice_agent_pb2.EXEC_ERROR
 
             elif action == "pause":
-                if self.media_controller.pause():
+                if media_controller.pause():
                     exec_response = "Yay, I successfully paused the media."
                     exec_status = voice_agent_pb2.EXEC_SUCCESS
                 else:
@@ -505,7 +1413,7 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
                     exec_status = voice_agent_pb2.EXEC_ERROR
 
             elif action == "next":
-                if self.media_controller.next():
+                if media_controller.next():
                     exec_response = "Yay, I successfully played the next track."
                     exec_status = voice_agent_pb2.EXEC_SUCCESS
                 else:
@@ -513,7 +1421,7 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
                     exec_status = voice_agent_pb2.EXEC_ERROR
 
             elif action == "previous":
-                if self.media_controller.previous():
+                if media_controller.previous():
                     exec_response = "Yay, I successfully played the previous track."
                     exec_status = voice_agent_pb2.EXEC_SUCCESS
                 else:
@@ -521,7 +1429,7 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
                     exec_status = voice_agent_pb2.EXEC_ERROR
                     
             elif action == "stop":
-                if self.media_controller.stop():
+                if media_controller.stop():
                     exec_response = "Yay, I successfully stopped the media."
                     exec_status = voice_agent_pb2.EXEC_SUCCESS
                 else:
@@ -539,7 +1447,15 @@ class VoiceAgentServicer(voice_agent_pb2_grpc.VoiceAgentServiceServicer):
             return response
 
 
-        execution_list = self.mapper.parse_intent(intent, processed_slots, req_id=request_id)
+        try:
+            mapper = self.mapper
+        except RuntimeError as e:
+            self.logger.error(f"[ReqID#{request_id}] Intent mapper is not available: {e}")
+            return voice_agent_pb2.ExecuteResult(
+                response=f"Sorry, I failed to execute command against intent '{intent}'.",
+                status=voice_agent_pb2.EXEC_ERROR
+            )
+        execution_list = mapper.parse_intent(intent, processed_slots, req_id=request_id)
         exec_response = f"Sorry, I failed to execute command against intent '{intent}'. Maybe try again with more specific instructions."
         exec_status = voice_agent_pb2.EXEC_ERROR
         # Check for kuksa status, and try re-connecting again if status is False 
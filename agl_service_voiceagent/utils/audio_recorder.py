@@ -16,8 +16,12 @@
 
 import gi
 import time
+import wave
+import queue
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst, GLib
+from agl_service_voiceagent.utils.vad import VADEndpointer
+from agl_service_voiceagent.utils.common import generate_unique_uuid
 
 Gst.init(None)
 GLib.threads_init()
@@ -27,7 +31,7 @@ class AudioRecorder:
     AudioRecorder is a class for recording audio using GStreamer in various modes.
     """
 
-    def __init__(self, stt_model, audio_files_basedir, channels=1, sample_rate=16000, bits_per_sample=16):
+    def __init__(self, stt_model, audio_files_basedir, channels=1, sample_rate=16000, bits_per_sample=16, endpointer=None, capture_mode="file", store_audio=True, queue_size=1000, capture_pipeline=None, capture_start_position=None, capture_subscription=None):
         """
         Initialize the AudioRecorder instance with the provided parameters.
 
@@ -37,6 +41,20 @@ class AudioRecorder:
             channels (int, optional): The number of audio channels (default is 1).
             sample_rate (int, optional): The audio sample rate in Hz (default is 16000).
             bits_per_sample (int, optional): The number of bits per sample (default is 16).
+            endpointer (VADEndpointer, optional): The endpointer that ends recordings in 'auto' mode (default is a
+                VADEndpointer with default settings).
+            capture_mode (str, optional): 'file' records to a WAV file, 'memory' pushes the PCM buffers into an
+                in-memory queue that is consumed with `get_audio_chunks` (default is 'file').
+            store_audio (bool, optional): In 'memory' capture mode, whether a WAV file is also recorded (default is True).
+            queue_size (int, optional): The maximum number of buffers held by the in-memory queue (default is 1000).
+            capture_pipeline (CapturePipeline, optional): A shared, pre-warmed capture pipeline to record from instead
+                of building a new pipeline for this recording (default is None).
+            capture_start_position (int, optional): The capture position of the shared capture pipeline the recording
+                starts from, e.g. the position where the wake word was detected (default is None, start at the
+                current position).
+            capture_subscription (CaptureSubscription, optional): A subscription to the shared capture pipeline to
+                record from instead of subscribing, e.g. the one handed over by the wake word detector. The recorder
+                takes ownership of it (default is None).
         """
         self.loop = GLib.MainLoop()
         self.mode = None
@@ -50,18 +68,31 @@ class AudioRecorder:
         self.audio_model = stt_model
         self.buffer_duration = 1  # Buffer audio for atleast 1 second
         self.audio_buffer = bytearray()
-        self.energy_threshold = 50000  # Adjust this threshold as needed
-        self.silence_frames_threshold = 10
-        self.frames_above_threshold = 0
+        self.endpointer = endpointer or VADEndpointer()
+        self.level_interval_ms = 20
+        self.recording_stopped = False
+        self.capture_mode = capture_mode
+        self.store_audio = store_audio
+        self.audio_queue = queue.Queue(maxsize=queue_size)
+        self.capture_finished = False
+        self.capture_pipeline = capture_pipeline
+        self.capture_start_position = capture_start_position
+        self.capture_subscription = capture_subscription
+        self.subscription = None
+        self.audio_file_name = None
     
 
     def create_pipeline(self):
         """
-        Create and configure the GStreamer audio recording pipeline.
+        Create and configure the GStreamer audio recording pipeline. In 'memory' capture mode the audio is delivered
+        through an appsink, and the WAV file is only written by an optional tee branch.
 
         Returns:
-            str: The name of the audio file being recorded.
+            str: The name of the audio file being recorded, or None if no file is recorded.
         """
+        if self.capture_pipeline is not None:
+            return self.subscribe_capture()
+
         print("Creating pipeline for audio recording in {} mode...".format(self.mode))
         self.pipeline = Gst.Pipeline()
         autoaudiosrc = Gst.ElementFactory.make("alsasrc", None)
@@ -70,7 +101,6 @@ class AudioRecorder:
         queue.set_property("max-size-bytes", 0)
         queue.set_property("max-size-time", 0)
         audioconvert = Gst.ElementFactory.make("audioconvert", None)
-        wavenc = Gst.ElementFactory.make("wavenc", None)
 
         capsfilter = Gst.ElementFactory.make("capsfilter", None)
         caps = Gst.Caps.new_empty_simple("audio/x-raw")
@@ -82,20 +112,59 @@ class AudioRecorder:
         self.pipeline.add(autoaudiosrc)
         self.pipeline.add(queue)
         self.pipeline.add(audioconvert)
-        self.pipeline.add(wavenc)
         self.pipeline.add(capsfilter)
         
         autoaudiosrc.link(queue)
         queue.link(audioconvert)
         audioconvert.link(capsfilter)
+        last_element = capsfilter
+
+        if self.mode == "auto":
+            # The level element posts the RMS of every interval on the bus, which drives the VAD endpointer
+            level = Gst.ElementFactory.make("level", None)
+            level.set_property("interval", self.level_interval_ms * Gst.MSECOND)
+            level.set_property("post-messages", True)
+            self.pipeline.add(level)
+            last_element.link(level)
+            last_element = level
+            self.endpointer.reset()
+
+        audio_file_name = None
+        record_file = self.capture_mode != "memory" or self.store_audio
+        if record_file:
+            # The suffix keeps recordings started within the same second apart
+            audio_file_name = f"{self.audio_files_basedir}{int(time.time())}_{generate_unique_uuid(6)}.wav"
+
+        if self.capture_mode == "memory":
+            appsink = Gst.ElementFactory.make("appsink", None)
+            appsink.set_property("emit-signals", True)
+            appsink.set_property("sync", False)
+            appsink.connect("new-sample", self.on_new_sample)
+            self.pipeline.add(appsink)
 
-        audio_file_name = f"{self.audio_files_basedir}{int(time.time())}.wav"
+            if record_file:
+                tee = Gst.ElementFactory.make("tee", None)
+                memory_queue = Gst.ElementFactory.make("queue", None)
+                file_queue = Gst.ElementFactory.make("queue", None)
+                self.pipeline.add(tee)
+                self.pipeline.add(memory_queue)
+                self.pipeline.add(file_queue)
+                last_element.link(tee)
+                tee.link(memory_queue)
+                memory_queue.link(appsink)
+                tee.link(file_queue)
+                last_element = file_queue
+            else:
+                last_element.link(appsink)
 
-        filesink = Gst.ElementFactory.make("filesink", None)
-        filesink.set_property("location", audio_file_name)
-        self.pipeline.add(filesink)
-        capsfilter.link(wavenc)
-        wavenc.link(filesink)
+        if record_file:
+            wavenc = Gst.ElementFactory.make("wavenc", None)
+            filesink = Gst.ElementFactory.make("filesink", None)
+            filesink.set_property("location", audio_file_name)
+            self.pipeline.add(wavenc)
+            self.pipeline.add(filesink)
+            last_element.link(wavenc)
+            wavenc.link(filesink)
 
         self.bus = self.pipeline.get_bus()
         self.bus.add_signal_watch()
@@ -104,10 +173,102 @@ class AudioRecorder:
         return audio_file_name
 
 
+    def subscribe_capture(self):
+        """
+        Subscribe to the shared capture pipeline. The recording starts at the capture start position, which can be
+        before the subscription (e.g. the pre-roll), so the first syllable of the command isn't clipped.
+
+        Returns:
+            str: The name of the audio file being recorded, or None if no file is recorded.
+        """
+        print("Recording from the shared capture pipeline in {} mode...".format(self.mode))
+        self.audio_file_name = None
+        if self.capture_mode != "memory" or self.store_audio:
+            self.audio_file_name = f"{self.audio_files_basedir}{int(time.time())}_{generate_unique_uuid(6)}.wav"
+        if self.mode == "auto":
+            self.endpointer.reset()
+        self.subscription = self.capture_subscription or self.capture_pipeline.subscribe(self.capture_start_position)
+        return self.audio_file_name
+
+
+    def record_capture(self):
+        """
+        Record the audio delivered by the shared capture pipeline until the recording is stopped.
+        """
+        wf = None
+        if self.audio_file_name is not None:
+            wf = wave.open(self.audio_file_name, "wb")
+            wf.setnchannels(self.channels)
+            wf.setsampwidth(self.bits_per_sample // 8)
+            wf.setframerate(self.sample_rate)
+
+        bytes_per_ms = self.sample_rate * self.channels * self.bits_per_sample // 8 / 1000
+        try:
+            for chunk in self.subscription.get_audio_chunks():
+                if wf is not None:
+                    wf.writeframes(chunk)
+                if self.capture_mode == "memory":
+                    try:
+                        self.audio_queue.put_nowait(chunk)
+                    except queue.Full:
+                        print("[-] Audio queue is full, dropping captured audio.")
+                if self.mode == "auto" and not self.recording_stopped:
+                    if self.endpointer.process(chunk, len(chunk) / bytes_per_ms):
+                        print("End of speech detected.")
+                        self.stop_recording()
+        finally:
+            if wf is not None:
+                wf.close()
+            self.capture_finished = True
+
+
+    def on_new_sample(self, appsink):
+        """
+        Push the PCM buffer of a new appsink sample into the in-memory queue.
+
+        Args:
+            appsink (Gst.Element): The appsink that received the sample.
+
+        Returns:
+            Gst.FlowReturn: OK to keep the pipeline running.
+        """
+        sample = appsink.emit("pull-sample")
+        buffer = sample.get_buffer()
+        success, map_info = buffer.map(Gst.MapFlags.READ)
+        if success:
+            try:
+                self.audio_queue.put_nowait(bytes(map_info.data))
+            except queue.Full:
+                print("[-] Audio queue is full, dropping captured audio.")
+            finally:
+                buffer.unmap(map_info)
+        return Gst.FlowReturn.OK
+
+
+    def get_audio_chunks(self):
+        """
+        Consume the PCM buffers captured in 'memory' capture mode as they arrive, until the recording has finished.
+
+        Yields:
+            bytes: Raw PCM audio chunks.
+        """
+        while True:
+            try:
+                yield self.audio_queue.get(timeout=0.1)
+            except queue.Empty:
+                # Every buffer is queued before the end-of-stream reaches the bus
+                if self.capture_finished:
+                    break
+
+
     def start_recording(self):
         """
         Start recording audio using the GStreamer pipeline.
         """
+        if self.subscription is not None:
+            print("Recording Voice Input...")
+            self.record_capture()
+            return
         self.pipeline.set_state(Gst.State.PLAYING)
         self.loop.run()
         print("Recording Voice Input...")
@@ -117,6 +278,14 @@ class AudioRecorder:
         """
         Stop audio recording and clean up the GStreamer pipeline.
         """
+        if self.subscription is not None:
+            if not self.recording_stopped:
+                self.recording_stopped = True
+                self.capture_pipeline.unsubscribe(self.subscription)
+            return
+        if self.recording_stopped or self.pipeline is None:
+            return
+        self.recording_stopped = True
         print("Stopping recording...")
         # self.cleanup_pipeline()
         self.pipeline.send_event(Gst.Event.new_eos())
@@ -163,17 +332,13 @@ class AudioRecorder:
                        (old_state.value_nick, new_state.value_nick)))
                 
         elif self.mode == "auto" and message.type == Gst.MessageType.ELEMENT:
-            if message.get_structure().get_name() == "level":
-                rms = message.get_structure()["rms"][0]
-                if rms > self.energy_threshold:
-                    self.frames_above_threshold += 1
-                    # if self.frames_above_threshold >= self.silence_frames_threshold:
-                    #     self.start_recording()
-                else:
-                    if self.frames_above_threshold > 0:
-                        self.frames_above_threshold -= 1
-                        if self.frames_above_threshold == 0:
-                            self.stop_recording()
+            structure = message.get_structure()
+            if structure.get_name() == "level":
+                # rms holds the level of every channel in dB, use the loudest one
+                rms = max(structure.get_value("rms"))
+                if self.endpointer.update(rms, self.level_interval_ms):
+                    print("End of speech detected.")
+                    self.stop_recording()
     
 
     def cleanup_pipeline(self):
@@ -187,6 +352,7 @@ class AudioRecorder:
             print("Pipeline cleanup complete!")
             self.bus = None
             self.pipeline = None
+            self.capture_finished = True
             self.loop.quit()
 
 from time import sleep
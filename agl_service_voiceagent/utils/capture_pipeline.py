@@ -0,0 +1,397 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gi
+import queue
+import threading
+from collections import deque
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+Gst.init(None)
+
+
+class CaptureSubscription:
+    """
+    CaptureSubscription is a consumer of a CapturePipeline. The captured PCM buffers are delivered through a bounded
+    queue and consumed with `get_audio_chunks`.
+    """
+
+    def __init__(self, queue_size=1000, start_position=0):
+        """
+        Initialize the CaptureSubscription instance.
+
+        Args:
+            queue_size (int, optional): The maximum number of buffers held by the queue (default is 1000).
+            start_position (int, optional): The capture position, in bytes, of the first delivered byte (default is 0).
+        """
+        self.audio_queue = queue.Queue(maxsize=queue_size)
+        self.start_position = start_position
+        self.closed = False
+
+    def push(self, chunk):
+        """
+        Deliver a captured PCM buffer to the subscriber. The buffer is dropped if the subscriber falls too far behind.
+
+        Args:
+            chunk (bytes): Raw PCM audio.
+        """
+        try:
+            self.audio_queue.put_nowait(chunk)
+        except queue.Full:
+            print("[-] Capture subscriber queue is full, dropping captured audio.")
+
+    def get_audio_chunks(self):
+        """
+        Consume the captured PCM buffers as they arrive, until the subscription is closed.
+
+        Yields:
+            bytes: Raw PCM audio chunks.
+        """
+        while True:
+            try:
+                yield self.audio_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.closed:
+                    break
+
+    def close(self):
+        """
+        Close the subscription. The buffers already queued are still delivered.
+        """
+        self.closed = True
+
+
+class CapturePipeline:
+    """
+    CapturePipeline is a long-lived GStreamer capture pipeline shared across sessions. Building the graph and opening
+    the audio device is only paid once, sessions subscribe to the captured audio instead of creating their own
+    pipeline. When pre-roll is enabled the pipeline keeps capturing while idle, so that a subscriber can also receive
+    the audio captured before it subscribed.
+
+    Every captured byte has an absolute capture position, so a consumer can hand over to another one at an exact
+    position (e.g. from the wake word detector to the command recorder) without losing audio in between.
+    """
+
+    def __init__(self, source="alsasrc", channels=1, sample_rate=16000, bits_per_sample=16, preroll_ms=500, queue_size=1000):
+        """
+        Initialize the CapturePipeline instance with the provided parameters.
+
+        Args:
+            source (str, optional): The GStreamer source element, e.g. 'alsasrc' or 'autoaudiosrc' (default is 'alsasrc').
+            channels (int, optional): The number of audio channels (default is 1).
+            sample_rate (int, optional): The audio sample rate in Hz (default is 16000).
+            bits_per_sample (int, optional): The number of bits per sample (default is 16).
+            preroll_ms (int, optional): The amount of captured audio history in milliseconds, which subscriptions can
+                start from. If 0, the pipeline is kept in READY while idle instead of capturing (default is 500).
+            queue_size (int, optional): The maximum number of buffers queued for every subscriber (default is 1000).
+        """
+        self.source = source
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.bits_per_sample = bits_per_sample
+        self.preroll_ms = preroll_ms
+        self.queue_size = queue_size
+        self.bytes_per_second = sample_rate * channels * bits_per_sample // 8
+        self.history_size = int(self.bytes_per_second * preroll_ms / 1000)
+        self.frame_size = channels * bits_per_sample // 8
+        self.history = deque()
+        self.history_bytes = 0
+        self.position = 0
+        self.subscribers = []
+        # The lock guards the history and the subscribers and is taken by the streaming thread. State changes can
+        # wait for the streaming thread, so they are serialized by a separate lock and never made holding the first.
+        self.lock = threading.Lock()
+        self.state_lock = threading.RLock()
+        self.pipeline = None
+        self.bus = None
+        self.failed = False
+
+    def create_pipeline(self):
+        """
+        Create and configure the GStreamer capture pipeline.
+        """
+        print(f"Creating shared capture pipeline with {self.source}...")
+        self.pipeline = Gst.Pipeline()
+        source = Gst.ElementFactory.make(self.source, None)
+        queue = Gst.ElementFactory.make("queue", None)
+        audioconvert = Gst.ElementFactory.make("audioconvert", None)
+        audioresample = Gst.ElementFactory.make("audioresample", None)
+
+        capsfilter = Gst.ElementFactory.make("capsfilter", None)
+        caps = Gst.Caps.new_empty_simple("audio/x-raw")
+        caps.set_value("format", "S16LE")
+        caps.set_value("rate", self.sample_rate)
+        caps.set_value("channels", self.channels)
+        capsfilter.set_property("caps", caps)
+
+        appsink = Gst.ElementFactory.make("appsink", None)
+        appsink.set_property("emit-signals", True)
+        appsink.set_property("sync", False)
+        appsink.connect("new-sample", self.on_new_sample)
+
+        for element in (source, queue, audioconvert, audioresample, capsfilter, appsink):
+            self.pipeline.add(element)
+        source.link(queue)
+        queue.link(audioconvert)
+        audioconvert.link(audioresample)
+        audioresample.link(capsfilter)
+        capsfilter.link(appsink)
+
+        # There is no main loop running for the shared pipeline, so errors are handled synchronously
+        self.bus = self.pipeline.get_bus()
+        self.bus.enable_sync_message_emission()
+        self.bus.connect("sync-message::error", self.on_error)
+        self.failed = False
+
+    def prepare(self):
+        """
+        Create the pipeline if needed and bring it to its idle state: PLAYING if pre-roll is enabled, READY (with
+        the audio device open) otherwise.
+        """
+        with self.state_lock:
+            if self.failed:
+                self.cleanup_pipeline()
+            if self.pipeline is None:
+                self.create_pipeline()
+            with self.lock:
+                active = self.history_size > 0 or len(self.subscribers) > 0
+            self.pipeline.set_state(Gst.State.PLAYING if active else Gst.State.READY)
+
+    def get_position(self):
+        """
+        Get the current capture position.
+
+        Returns:
+            int: The number of bytes captured so far.
+        """
+        with self.lock:
+            return self.position
+
+    def get_position_before(self, duration_ms, position=None):
+        """
+        Get the capture position a given duration before another position.
+
+        Args:
+            duration_ms (float): The duration in milliseconds.
+            position (int, optional): The reference capture position (default is the current position).
+
+        Returns:
+            int: The frame-aligned capture position.
+        """
+        if position is None:
+            position = self.get_position()
+        position -= int(self.bytes_per_second * duration_ms / 1000)
+        return max(0, position - position % self.frame_size)
+
+    def subscribe(self, from_position=None):
+        """
+        Subscribe to the captured audio, starting the capture if needed.
+
+        Args:
+            from_position (int, optional): The capture position to start delivering audio from. Audio that is still in
+                the history is delivered first, older audio is lost (default is None, start at the current position).
+
+        Returns:
+            CaptureSubscription: The new subscription.
+        """
+        with self.state_lock:
+            self.prepare()
+            with self.lock:
+                if from_position is None:
+                    from_position = self.position
+                from_position = max(from_position, self.position - self.history_bytes)
+                subscription = CaptureSubscription(self.queue_size, from_position)
+                chunk_start = self.position - self.history_bytes
+                for chunk in self.history:
+                    chunk_end = chunk_start + len(chunk)
+                    if chunk_end > from_position:
+                        subscription.push(chunk[max(0, from_position - chunk_start):])
+                    chunk_start = chunk_end
+                self.subscribers.append(subscription)
+            self.pipeline.set_state(Gst.State.PLAYING)
+        return subscription
+
+    def hand_over(self, subscription, position, pending_audio=b""):
+        """
+        Replace a subscription with a new one starting at a given capture position, e.g. where the wake word ended.
+        The audio of the old subscription that its consumer hasn't processed yet is moved to the new subscription, so
+        no audio is lost or duplicated in between and no history is needed. Must be called from the consumer thread of
+        the old subscription.
+
+        Args:
+            subscription (CaptureSubscription): The subscription to replace, which is closed.
+            position (int): The capture position of the first byte of the new subscription.
+            pending_audio (bytes, optional): The audio from `position` the old consumer has already taken out of its
+                subscription but not processed (default is none).
+
+        Returns:
+            CaptureSubscription: The new subscription, or None if the old one was already removed.
+        """
+        subscription.close()
+        with self.lock:
+            if subscription not in self.subscribers:
+                return None
+            handoff = CaptureSubscription(self.queue_size, position)
+            if pending_audio:
+                handoff.push(bytes(pending_audio))
+            while True:
+                try:
+                    handoff.push(subscription.audio_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.subscribers[self.subscribers.index(subscription)] = handoff
+        return handoff
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription. The pipeline goes back to its idle state once the last subscriber is gone.
+
+        Args:
+            subscription (CaptureSubscription): The subscription to remove.
+        """
+        subscription.close()
+        with self.state_lock:
+            with self.lock:
+                if subscription in self.subscribers:
+                    self.subscribers.remove(subscription)
+                idle = len(self.subscribers) == 0
+            if idle and self.history_size == 0 and self.pipeline is not None:
+                self.pipeline.set_state(Gst.State.READY)
+
+    def on_new_sample(self, appsink):
+        """
+        Keep a new captured buffer in the pre-roll history and deliver it to every subscriber.
+
+        Args:
+            appsink (Gst.Element): The appsink that received the sample.
+
+        Returns:
+            Gst.FlowReturn: OK to keep the pipeline running.
+        """
+        sample = appsink.emit("pull-sample")
+        buffer = sample.get_buffer()
+        success, map_info = buffer.map(Gst.MapFlags.READ)
+        if not success:
+            return Gst.FlowReturn.OK
+        try:
+            chunk = bytes(map_info.data)
+        finally:
+            buffer.unmap(map_info)
+
+        with self.lock:
+            self.position += len(chunk)
+            if self.history_size > 0:
+                self.history.append(chunk)
+                self.history_bytes += len(chunk)
+                while self.history_bytes - len(self.history[0]) >= self.history_size:
+                    self.history_bytes -= len(self.history.popleft())
+            for subscription in self.subscribers:
+                subscription.push(chunk)
+        return Gst.FlowReturn.OK
+
+    def on_error(self, bus, message):
+        """
+        Handle an error of the pipeline. The subscribers are closed and the pipeline is rebuilt on next use.
+
+        Args:
+            bus (Gst.Bus): The GStreamer bus.
+            message (Gst.Message): The error message.
+        """
+        err, debug_info = message.parse_error()
+        print(f"Error received from element {message.src.get_name()}: {err.message}")
+        print(f"Debugging information: {debug_info}")
+        with self.lock:
+            self.failed = True
+            for subscription in self.subscribers:
+                subscription.close()
+            self.subscribers = []
+
+    def cleanup_pipeline(self):
+        """
+        Set the pipeline to the NULL state and release it. Must be called with the state lock held. The capture
+        position keeps increasing across pipeline rebuilds.
+        """
+        if self.pipeline is not None:
+            print("Cleaning up shared capture pipeline...")
+            self.pipeline.set_state(Gst.State.NULL)
+            self.pipeline = None
+            self.bus = None
+        with self.lock:
+            self.history.clear()
+            self.history_bytes = 0
+
+    def stop(self):
+        """
+        Close all the subscriptions and release the pipeline.
+        """
+        with self.state_lock:
+            with self.lock:
+                for subscription in self.subscribers:
+                    subscription.close()
+                self.subscribers = []
+            self.cleanup_pipeline()
+
+
+class CapturePipelinePool:
+    """
+    CapturePipelinePool keeps one pre-warmed CapturePipeline per capture configuration and hands it out to every
+    session that captures with that configuration.
+    """
+
+    def __init__(self, preroll_ms=500, queue_size=1000):
+        """
+        Initialize the CapturePipelinePool instance.
+
+        Args:
+            preroll_ms (int, optional): The pre-roll of the pipelines in milliseconds (default is 500).
+            queue_size (int, optional): The maximum number of buffers queued for every subscriber (default is 1000).
+        """
+        self.preroll_ms = preroll_ms
+        self.queue_size = queue_size
+        self.pipelines = {}
+        self.lock = threading.Lock()
+
+    def get_pipeline(self, source="alsasrc", channels=1, sample_rate=16000, bits_per_sample=16):
+        """
+        Get the capture pipeline for a configuration, creating and pre-warming it on first use.
+
+        Args:
+            source (str, optional): The GStreamer source element (default is 'alsasrc').
+            channels (int, optional): The number of audio channels (default is 1).
+            sample_rate (int, optional): The audio sample rate in Hz (default is 16000).
+            bits_per_sample (int, optional): The number of bits per sample (default is 16).
+
+        Returns:
+            CapturePipeline: The shared capture pipeline.
+        """
+        key = (source, channels, sample_rate, bits_per_sample)
+        with self.lock:
+            pipeline = self.pipelines.get(key)
+            if pipeline is None:
+                pipeline = CapturePipeline(source, channels, sample_rate, bits_per_sample, self.preroll_ms, self.queue_size)
+                self.pipelines[key] = pipeline
+        pipeline.prepare()
+        return pipeline
+
+    def stop(self):
+        """
+        Release all the capture pipelines of the pool.
+        """
+        with self.lock:
+            for pipeline in self.pipelines.values():
+                pipeline.stop()
+            self.pipelines = {}
@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+import threading
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker stops calls to a failing dependency for a while, so that callers fail fast instead of waiting on
+    timeouts. The circuit opens after a number of consecutive failures. Once the reset timeout has passed a single
+    trial call is let through, and the circuit closes again if it succeeds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        Initialize the CircuitBreaker instance.
+
+        Args:
+            failure_threshold (int, optional): The number of consecutive failures that opens the circuit (default is 5).
+            reset_timeout (float, optional): The time in seconds the circuit stays open before a trial call is let
+                through (default is 30).
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        """
+        Check whether a call may be made.
+
+        Returns:
+            bool: True if the call may be made, False if the circuit is open.
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # let a single trial call through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Record a successful call, closing the circuit.
+        """
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """
+        Record a failed call, opening the circuit once the failure threshold is reached or if the trial call failed.
+        """
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"[-] Circuit opened after {self.failures} consecutive failures.")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
@@ -38,6 +38,20 @@ def generate_unique_uuid(length):
     return unique_id
 
 
+def get_memory_usage():
+    """
+    Gets the resident memory (RSS) of the current process in megabytes, or None if it can't be determined.
+    """
+    try:
+        with open("/proc/self/status", "r") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
 def load_json_file(file_path):
     """
     Loads a JSON file and returns the data.
@@ -0,0 +1,187 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+import threading
+from agl_service_voiceagent.utils.config import get_logger
+from agl_service_voiceagent.utils.common import get_memory_usage
+
+
+class Component:
+    """
+    Component holds the loader, the loading state and the loaded instance of a service component.
+    """
+
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, name, loader, lazy=False):
+        """
+        Initialize the Component instance.
+
+        Args:
+            name (str): The name of the component.
+            loader (callable): Creates the component instance.
+            lazy (bool, optional): If True, the component is only loaded on first use (default is False).
+        """
+        self.name = name
+        self.loader = loader
+        self.lazy = lazy
+        self.state = self.PENDING
+        self.instance = None
+        self.error = None
+        self.load_time = None
+        self.loaded = threading.Event()
+        # Number of consecutive failed loads and when a failed lazy component may be loaded again
+        self.failures = 0
+        self.retry_time = None
+
+
+class ComponentRegistry:
+    """
+    ComponentRegistry loads the components of the service in stages. Components are loaded in parallel in background
+    threads, or lazily on first use, so the service can start serving requests before all of them are loaded. Getting
+    a component waits until it is loaded. A lazy component that failed to load is loaded again on a later use, with an
+    exponential backoff between attempts, so it recovers once e.g. the service it connects to is back.
+    """
+
+    def __init__(self, retry_interval=1, max_retry_interval=60):
+        """
+        Initialize the ComponentRegistry instance.
+
+        Args:
+            retry_interval (float, optional): The number of seconds before a failed lazy component is loaded again,
+                doubled after every consecutive failure (default is 1).
+            max_retry_interval (float, optional): The maximum number of seconds between two attempts (default is 60).
+        """
+        self.components = {}
+        self.lock = threading.Lock()
+        self.logger = get_logger()
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+    def register(self, name, loader, lazy=False):
+        """
+        Register a component.
+
+        Args:
+            name (str): The name of the component.
+            loader (callable): Creates the component instance.
+            lazy (bool, optional): If True, the component is only loaded on first use (default is False).
+        """
+        self.components[name] = Component(name, loader, lazy)
+
+    def start(self):
+        """
+        Start loading all the components that aren't lazy, each in its own background thread.
+        """
+        for component in self.components.values():
+            if not component.lazy:
+                threading.Thread(target=self.load, args=(component.name,), daemon=True).start()
+
+    def load(self, name):
+        """
+        Load a component, unless it is already loaded or being loaded.
+
+        Args:
+            name (str): The name of the component.
+        """
+        component = self.components[name]
+        with self.lock:
+            if component.state == Component.FAILED and component.lazy and time.monotonic() >= component.retry_time:
+                component.state = Component.PENDING
+                component.loaded = threading.Event()
+            if component.state != Component.PENDING:
+                return
+            component.state = Component.LOADING
+            loaded = component.loaded
+
+        start_time = time.monotonic()
+        try:
+            self.logger.info(f"Loading component '{name}'...")
+            component.instance = component.loader()
+            component.error = None
+            component.failures = 0
+            component.state = Component.READY
+        except Exception as e:
+            component.error = str(e)
+            component.failures += 1
+            retry_interval = min(self.retry_interval * 2 ** (component.failures - 1), self.max_retry_interval)
+            component.retry_time = time.monotonic() + retry_interval
+            component.state = Component.FAILED
+        finally:
+            # waiters are released even if the loader failed
+            component.load_time = time.monotonic() - start_time
+            loaded.set()
+
+        if component.state == Component.READY:
+            self.logger.info(f"Component '{name}' loaded in {component.load_time:.2f} seconds. Resident memory: {get_memory_usage()} MB.")
+        else:
+            self.logger.error(f"Failed to load component '{name}': {component.error}")
+
+    def get(self, name, timeout=None):
+        """
+        Get a component, loading it first if it is lazy and waiting for it if it is being loaded.
+
+        Args:
+            name (str): The name of the component.
+            timeout (float, optional): The maximum time in seconds to wait for the component (default is None,
+                which waits until it is loaded).
+
+        Returns:
+            object: The component instance.
+
+        Raises:
+            TimeoutError: If the component isn't loaded within the timeout.
+            RuntimeError: If the component failed to load. A lazy component is loaded again by a later call once its
+                retry backoff has elapsed.
+        """
+        component = self.components[name]
+        if component.state == Component.READY:
+            return component.instance
+
+        self.load(name)
+        if not component.loaded.wait(timeout):
+            raise TimeoutError(f"Component '{name}' is not loaded after {timeout} seconds.")
+        # a failed lazy component can already be loading again, the waiters of the failed attempt get its error
+        if component.state != Component.READY:
+            raise RuntimeError(f"Component '{name}' failed to load: {component.error}")
+        return component.instance
+
+    def is_ready(self, name):
+        """
+        Check whether a component is loaded.
+
+        Args:
+            name (str): The name of the component.
+
+        Returns:
+            bool: True if the component is loaded, False otherwise.
+        """
+        return self.components[name].state == Component.READY
+
+    def get_status(self):
+        """
+        Get the loading state of all the components.
+
+        Returns:
+            list: A dict per component with its name, state, load time in seconds (None until it is loaded) and error.
+        """
+        return [
+            {"name": c.name, "state": c.state, "load_time": c.load_time, "error": c.error}
+            for c in self.components.values()
+        ]
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class AudioRingBuffer:
+    """
+    AudioRingBuffer is a fixed-capacity FIFO byte buffer for raw audio. Its storage is allocated once, data is copied
+    in from and out to caller provided buffers, so no memory is allocated while audio flows through it.
+
+    The buffer is not thread-safe, callers sharing it between threads must provide their own locking.
+    """
+
+    def __init__(self, capacity):
+        """
+        Initialize the AudioRingBuffer instance with the provided capacity.
+
+        Args:
+            capacity (int): The maximum number of bytes the buffer can hold.
+        """
+        self.capacity = capacity
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.read_pos = 0
+        self.size = 0
+
+    def __len__(self):
+        """
+        Get the number of bytes currently stored in the buffer.
+        """
+        return self.size
+
+    def get_free_space(self):
+        """
+        Get the number of bytes that can be written before the buffer is full.
+
+        Returns:
+            int: The free space in bytes.
+        """
+        return self.capacity - self.size
+
+    def write(self, data):
+        """
+        Copy as much of the data as fits into the buffer.
+
+        Args:
+            data (bytes-like): The data to write.
+
+        Returns:
+            int: The number of bytes written, which is less than the size of the data if the buffer is full.
+        """
+        data = memoryview(data).cast("B")
+        count = min(len(data), self.get_free_space())
+        write_pos = (self.read_pos + self.size) % self.capacity
+        first_part = min(count, self.capacity - write_pos)
+        self.view[write_pos:write_pos + first_part] = data[:first_part]
+        if first_part < count:
+            self.view[:count - first_part] = data[first_part:count]
+        self.size += count
+        return count
+
+    def read_into(self, out):
+        """
+        Move data from the buffer into a caller provided buffer.
+
+        Args:
+            out (bytearray or memoryview): The writable buffer to fill.
+
+        Returns:
+            int: The number of bytes read, which is less than the size of `out` if the buffer holds less data.
+        """
+        out = memoryview(out).cast("B")
+        count = min(len(out), self.size)
+        first_part = min(count, self.capacity - self.read_pos)
+        out[:first_part] = self.view[self.read_pos:self.read_pos + first_part]
+        if first_part < count:
+            out[first_part:count] = self.view[:count - first_part]
+        self.read_pos = (self.read_pos + count) % self.capacity
+        self.size -= count
+        return count
+
+    def clear(self):
+        """
+        Discard all the data stored in the buffer.
+        """
+        self.read_pos = 0
+        self.size = 0
@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+
+class StageTimer:
+    """
+    StageTimer measures how long the stages of a request take (e.g. speech to text, NLU), so the latency of every
+    stage can be logged per request.
+    """
+
+    def __init__(self):
+        """
+        Initialize the StageTimer instance.
+        """
+        self.start_times = {}
+        self.timings = {}
+
+    def start(self, stage):
+        """
+        Start timing a stage.
+
+        Args:
+            stage (str): The name of the stage.
+        """
+        self.start_times[stage] = time.monotonic()
+
+    def stop(self, stage):
+        """
+        Stop timing a stage. A stage timed more than once accumulates its durations.
+
+        Args:
+            stage (str): The name of the stage.
+
+        Returns:
+            float: The duration of this run of the stage in seconds, or 0.0 if the stage wasn't started.
+        """
+        start_time = self.start_times.pop(stage, None)
+        if start_time is None:
+            return 0.0
+        elapsed = time.monotonic() - start_time
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+        return elapsed
+
+    def get_timings(self):
+        """
+        Get the durations of the stages.
+
+        Returns:
+            dict: The duration of every stage in milliseconds.
+        """
+        return {stage: round(elapsed * 1000, 1) for stage, elapsed in self.timings.items()}
+
+    def format_timings(self):
+        """
+        Format the durations of the stages for logging.
+
+        Returns:
+            str: The durations, e.g. "stt=850.2ms nlu=12.3ms".
+        """
+        return " ".join(f"{stage}={elapsed}ms" for stage, elapsed in self.get_timings().items())
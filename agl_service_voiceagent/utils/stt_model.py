@@ -14,52 +14,230 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import os
 import json
+import time
 import vosk
 import wave
+import signal
+import threading
 from agl_service_voiceagent.utils.common import generate_unique_uuid
 
 # import the whisper model
 # import whisper
 # for whisper timeout feature
-from concurrent.futures import ThreadPoolExecutor  
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import subprocess
 from time import sleep
 
+class VoskModelRegistry:
+    """
+    VoskModelRegistry is a process-wide registry that loads every Vosk model only once, so that all the STTModel
+    instances using the same model path share a single copy of the model in memory.
+    """
+
+    _models = {}
+    _load_times = {}
+    _model_locks = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_model(cls, model_path):
+        """
+        Get the Vosk model for the given path, loading it on first use.
+
+        Args:
+            model_path (str): The path to the Vosk speech recognition model.
+
+        Returns:
+            vosk.Model: The shared Vosk model instance.
+        """
+        key = os.path.realpath(model_path)
+        with cls._lock:
+            model_lock = cls._model_locks.setdefault(key, threading.Lock())
+
+        # Only hold the per-model lock while loading so that different models can be loaded in parallel
+        with model_lock:
+            if key not in cls._models:
+                start_time = time.monotonic()
+                cls._models[key] = vosk.Model(model_path)
+                cls._load_times[key] = time.monotonic() - start_time
+                print(f"Vosk model '{model_path}' loaded in {cls._load_times[key]:.2f} seconds.")
+            return cls._models[key]
+
+    @classmethod
+    def get_load_time(cls, model_path):
+        """
+        Get the time it took to load the Vosk model for the given path.
+
+        Args:
+            model_path (str): The path to the Vosk speech recognition model.
+
+        Returns:
+            float: The load time in seconds, or None if the model has not been loaded.
+        """
+        return cls._load_times.get(os.path.realpath(model_path))
+
+
+class RecognizerPool:
+    """
+    RecognizerPool keeps a bounded set of idle Vosk recognizers, so that they can be checked out and returned across
+    sessions instead of constructing a new KaldiRecognizer (and its decoder graphs) for every request.
+    """
+
+    def __init__(self, vosk_model, max_size=10, idle_timeout=300):
+        """
+        Initialize the RecognizerPool instance with the provided model and limits.
+
+        Args:
+            vosk_model (vosk.Model): The Vosk model used to construct new recognizers.
+            max_size (int, optional): The maximum number of idle recognizers kept in the pool (default is 10).
+            idle_timeout (float, optional): The number of seconds after which an idle recognizer is evicted (default is 300).
+        """
+        self.vosk_model = vosk_model
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.idle_recognizers = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, sample_rate, grammar=None):
+        """
+        Check out a recognizer for the given sample rate and grammar, constructing a new one if none is idle.
+
+        Args:
+            sample_rate (int): The sample rate of the audio the recognizer will process.
+            grammar (str, optional): A JSON list of phrases restricting the recognizer vocabulary (default is None).
+
+        Returns:
+            vosk.KaldiRecognizer: A recognizer ready to accept audio.
+        """
+        key = (sample_rate, grammar)
+        with self.lock:
+            self.evict_idle()
+            idle = self.idle_recognizers.get(key)
+            if idle:
+                recognizer, _ = idle.pop()
+                return recognizer
+
+        if grammar is not None:
+            return vosk.KaldiRecognizer(self.vosk_model, sample_rate, grammar)
+        return vosk.KaldiRecognizer(self.vosk_model, sample_rate)
+
+    def release(self, recognizer, sample_rate, grammar=None):
+        """
+        Reset a recognizer and return it to the pool. The recognizer is discarded if the pool is already full.
+
+        Args:
+            recognizer (vosk.KaldiRecognizer): The recognizer to return.
+            sample_rate (int): The sample rate the recognizer was created for.
+            grammar (str, optional): The grammar the recognizer was created with (default is None).
+        """
+        recognizer.Reset()
+        with self.lock:
+            self.evict_idle()
+            if self.get_idle_count() >= self.max_size:
+                return
+            self.idle_recognizers.setdefault((sample_rate, grammar), []).append((recognizer, time.monotonic()))
+
+    def evict_idle(self):
+        """
+        Drop the recognizers that have been idle for longer than the idle timeout. Must be called with the lock held.
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        for key in list(self.idle_recognizers):
+            idle = [entry for entry in self.idle_recognizers[key] if entry[1] >= deadline]
+            if idle:
+                self.idle_recognizers[key] = idle
+            else:
+                del self.idle_recognizers[key]
+
+    def get_idle_count(self):
+        """
+        Get the number of idle recognizers currently held by the pool.
+
+        Returns:
+            int: The number of idle recognizers.
+        """
+        return sum(len(idle) for idle in self.idle_recognizers.values())
+
+
 class STTModel:
     """
     STTModel is a class for speech-to-text (STT) recognition using the Vosk speech recognition library.
     """
 
-    def __init__(self, vosk_model_path,whisper_model_path,whisper_cpp_path,whisper_cpp_model_path,sample_rate=16000):
+    def __init__(self, vosk_model_path,whisper_model_path,whisper_cpp_path,whisper_cpp_model_path,sample_rate=16000,max_recognizers=10,recognizer_idle_timeout=300,whisper_worker=None,whisper_timeout=10,whisper_strategy="fallback"):
         """
         Initialize the STTModel instance with the provided model and sample rate.
 
         Args:
             model_path (str): The path to the Vosk speech recognition model.
             sample_rate (int, optional): The audio sample rate in Hz (default is 16000).
+            max_recognizers (int, optional): The maximum number of idle recognizers kept for reuse (default is 10).
+            recognizer_idle_timeout (float, optional): The number of seconds an idle recognizer is kept (default is 300).
+            whisper_worker (WhisperCppWorker, optional): A persistent whisper.cpp worker used instead of spawning the
+                whisper.cpp CLI for every recognition (default is None).
+            whisper_timeout (float, optional): The maximum number of seconds a whisper.cpp recognition may take
+                (default is 10).
+            whisper_strategy (str, optional): How whisper and Vosk are combined, "fallback" runs Vosk only after
+                whisper has failed, "race" runs both concurrently and prefers whisper if it finishes in time
+                (default is "fallback").
         """
         self.sample_rate = sample_rate
-        self.vosk_model = vosk.Model(vosk_model_path)
+        self.vosk_model = VoskModelRegistry.get_model(vosk_model_path)
+        self.recognizer_pool = RecognizerPool(self.vosk_model, max_recognizers, recognizer_idle_timeout)
         self.recognizer = {}
+        self.recognizer_params = {}
+        self.recognizer_lock = threading.Lock()
+        self.transcripts = {}
         self.chunk_size = 1024
         # self.whisper_model = whisper.load_model(whisper_model_path)
         self.whisper_cpp_path = whisper_cpp_path
         self.whisper_cpp_model_path = whisper_cpp_model_path
+        self.whisper_worker = whisper_worker
+        self.whisper_timeout = whisper_timeout
+        self.whisper_strategy = whisper_strategy
+        self.executor = ThreadPoolExecutor(max_workers=2 * max_recognizers)
     
 
-    def setup_vosk_recognizer(self):
+    def setup_vosk_recognizer(self, sample_rate=None, grammar=None):
         """
         Set up a Vosk recognizer for a new session and return a unique identifier (UUID) for the session.
 
+        Args:
+            sample_rate (int, optional): The sample rate of the audio fed to the session (default is the model sample rate).
+            grammar (list, optional): A list of phrases the recognizer is restricted to, e.g. a wake word and "[unk]".
+                Decoding against a small grammar is much cheaper than against the full vocabulary (default is None).
+
         Returns:
             str: A unique identifier (UUID) for the session.
         """
-        uuid = generate_unique_uuid(6)
-        self.recognizer[uuid] = vosk.KaldiRecognizer(self.vosk_model, self.sample_rate)
+        sample_rate = sample_rate or self.sample_rate
+        if grammar is not None:
+            grammar = json.dumps(grammar)
+        recognizer = self.recognizer_pool.acquire(sample_rate, grammar)
+        with self.recognizer_lock:
+            uuid = generate_unique_uuid(6)
+            while uuid in self.recognizer:
+                uuid = generate_unique_uuid(6)
+            self.recognizer[uuid] = recognizer
+            self.recognizer_params[uuid] = (sample_rate, grammar)
         return uuid
 
+    def get_recognizer(self, uuid):
+        """
+        Get the Vosk recognizer of a session.
+
+        Args:
+            uuid (str): The unique identifier (UUID) for the session.
+
+        Returns:
+            vosk.KaldiRecognizer: The recognizer checked out by the session.
+        """
+        with self.recognizer_lock:
+            return self.recognizer[uuid]
+
     def init_recognition(self, uuid, audio_data):
         """
         Initialize the Vosk recognizer for a session with audio data.
@@ -71,7 +249,178 @@ class STTModel:
         Returns:
             bool: True if initialization was successful, False otherwise.
         """
-        return self.recognizer[uuid].AcceptWaveform(audio_data)
+        return self.get_recognizer(uuid).AcceptWaveform(audio_data)
+
+    def accept_audio_chunk(self, uuid, audio_data):
+        """
+        Feed an audio chunk to the Vosk recognizer of a streaming session. Whenever the recognizer reaches an
+        utterance endpoint, the finalized text is kept so it can be returned by `finalize_recognition`.
+
+        Args:
+            uuid (str): The unique identifier (UUID) for the session.
+            audio_data (bytes): Audio data to process.
+
+        Returns:
+            bool: True if an utterance endpoint was reached, False otherwise.
+        """
+        if self.init_recognition(uuid, audio_data):
+            text = self.recognize_using_vosk(uuid)["text"]
+            if text:
+                with self.recognizer_lock:
+                    self.transcripts.setdefault(uuid, []).append(text)
+            return True
+        return False
+
+    def get_partial_transcript(self, uuid):
+        """
+        Get the current hypothesis of a streaming session: the text of the utterances that reached an endpoint
+        followed by the partial result of the utterance being decoded.
+
+        Args:
+            uuid (str): The unique identifier (UUID) for the session.
+
+        Returns:
+            str: The partial transcript.
+        """
+        partial = self.recognize_using_vosk(uuid, partial=True).get("partial", "")
+        with self.recognizer_lock:
+            segments = list(self.transcripts.get(uuid, []))
+        if partial:
+            segments.append(partial)
+        return " ".join(segments)
+
+    def finalize_recognition(self, uuid):
+        """
+        Flush the Vosk recognizer of a streaming session and return the complete transcript.
+
+        Args:
+            uuid (str): The unique identifier (UUID) for the session.
+
+        Returns:
+            str: The recognized text of all the audio fed to the session.
+        """
+        result = json.loads(self.get_recognizer(uuid).FinalResult())
+        with self.recognizer_lock:
+            segments = self.transcripts.pop(uuid, [])
+        if result.get("text"):
+            segments.append(result["text"])
+        return " ".join(segments)
+
+    def recognize_from_stream(self, uuid, audio_chunks, cancel_event=None, stt_framework="vosk", sample_rate=None, in_memory=True, audio_file=None):
+        """
+        Recognize speech from an iterable of raw PCM audio chunks. Each chunk is decoded by Vosk as soon as it is
+        produced, so the transcript is available right after the last chunk arrives. With whisper, the audio is
+        handed to whisper.cpp once the stream ends and the Vosk transcript is used if whisper fails.
+
+        Args:
+            uuid (str): The unique identifier (UUID) for the session.
+            audio_chunks (iterable): An iterable of raw mono 16-bit PCM audio chunks (bytes).
+            cancel_event (threading.Event, optional): When set, decoding stops at the next chunk (default is None).
+            stt_framework (str, optional): The STT framework to use for recognition (default is "vosk").
+            sample_rate (int, optional): The sample rate of the audio (default is the model sample rate).
+            in_memory (bool, optional): If True, whisper receives the audio from memory, otherwise it reads it back
+                from `audio_file` (default is True).
+            audio_file (str, optional): The path of a WAV file the audio is also written to (default is None).
+
+        Returns:
+            str: The recognized text or error messages.
+        """
+        sample_rate = sample_rate or self.sample_rate
+        use_whisper = stt_framework == "whisper"
+        pcm = bytearray() if use_whisper and in_memory else None
+        wf = None
+        if audio_file is not None:
+            wf = wave.open(audio_file, "wb")
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+
+        received_audio = False
+        try:
+            for chunk in audio_chunks:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                if not chunk:
+                    continue
+                received_audio = True
+                self.accept_audio_chunk(uuid, chunk)
+                if pcm is not None:
+                    pcm.extend(chunk)
+                if wf is not None:
+                    wf.writeframes(chunk)
+        finally:
+            if wf is not None:
+                wf.close()
+
+        if not received_audio:
+            print("Voice not recognized. Please speak again...")
+            return "VOICE_NOT_RECOGNIZED"
+
+        transcript = self.finalize_recognition(uuid)
+        if use_whisper and (pcm is not None or audio_file is not None):
+            result = self.recognize_using_whisper_cpp(pcm if pcm is not None else audio_file, cancel_event=cancel_event, sample_rate=sample_rate)
+            if 'error' not in result:
+                return result.get('text', '')
+
+            # If Whisper fails, fall back to the Vosk transcript
+            print(result['error'])
+
+        return transcript
+
+    def recognize_stream_with_partials(self, uuid, audio_chunks, endpointer=None, sample_rate=None, stt_framework="vosk"):
+        """
+        Recognize speech from an iterable of raw PCM audio chunks and report the hypothesis as it evolves. A new
+        partial transcript is produced whenever the hypothesis changes, and the final transcript once the audio ends
+        or the endpointer detects the end of speech.
+
+        Args:
+            uuid (str): The unique identifier (UUID) for the session.
+            audio_chunks (iterable): An iterable of raw mono 16-bit PCM audio chunks (bytes).
+            endpointer (VADEndpointer, optional): Ends the recognition at the end of speech (default is None, decode
+                until the audio ends).
+            sample_rate (int, optional): The sample rate of the audio (default is the model sample rate).
+            stt_framework (str, optional): The STT framework producing the final transcript, the partial transcripts
+                always come from Vosk (default is "vosk").
+
+        Yields:
+            tuple: (False, partial transcript) for every new hypothesis, then (True, final transcript or
+            "VOICE_NOT_RECOGNIZED").
+        """
+        sample_rate = sample_rate or self.sample_rate
+        bytes_per_ms = sample_rate * 2 / 1000
+        pcm = bytearray() if stt_framework == "whisper" else None
+        partial = ""
+        received_audio = False
+        for chunk in audio_chunks:
+            if not chunk:
+                continue
+            received_audio = True
+            self.accept_audio_chunk(uuid, chunk)
+            if pcm is not None:
+                pcm.extend(chunk)
+
+            text = self.get_partial_transcript(uuid)
+            if text and text != partial:
+                partial = text
+                yield False, partial
+
+            if endpointer is not None and endpointer.process(chunk, len(chunk) / bytes_per_ms):
+                break
+
+        if not received_audio:
+            yield True, "VOICE_NOT_RECOGNIZED"
+            return
+
+        transcript = self.finalize_recognition(uuid)
+        if pcm is not None:
+            result = self.recognize_using_whisper_cpp(pcm, sample_rate=sample_rate)
+            if 'error' not in result:
+                transcript = result.get('text', '')
+            else:
+                # If Whisper fails, fall back to the Vosk transcript
+                print(result['error'])
+
+        yield True, transcript
 
     # Recognize speech using the Vosk recognizer
     def recognize_using_vosk(self, uuid, partial=False):
@@ -85,12 +434,13 @@ class STTModel:
         Returns:
             dict: A JSON object containing recognition results.
         """
-        self.recognizer[uuid].SetWords(True)
+        recognizer = self.get_recognizer(uuid)
+        recognizer.SetWords(True)
         if partial:
-            result = json.loads(self.recognizer[uuid].PartialResult())
+            result = json.loads(recognizer.PartialResult())
         else:
-            result = json.loads(self.recognizer[uuid].Result())
-            self.recognizer[uuid].Reset()
+            result = json.loads(recognizer.Result())
+            recognizer.Reset()
         return result
     
     # Recognize speech using the whisper model
@@ -117,22 +467,148 @@ class STTModel:
     #         except TimeoutError:
     #             return {"error": "Transcription with Whisper exceeded the timeout."}
             
-    def recognize_using_whisper_cpp(self,filename):
-        # sleep(3)
-        # return {"text": "Can you reduce the volume"}
+    def recognize_using_whisper_cpp(self, audio, timeout=None, cancel_event=None, sample_rate=None):
+        """
+        Recognize speech using whisper.cpp. The persistent worker is used when it is available, otherwise (or if the
+        worker fails) the whisper.cpp CLI is spawned. The CLI process is killed if the timeout expires or the
+        recognition is cancelled.
+
+        Args:
+            audio (str or bytes): The path to a WAV file, or raw mono 16-bit PCM audio held in memory.
+            timeout (float, optional): The maximum number of seconds the recognition may take (default is the
+                whisper timeout of the model).
+            cancel_event (threading.Event, optional): When set, the recognition is abandoned (default is None).
+            sample_rate (int, optional): The sample rate of in-memory PCM audio (default is the model sample rate).
+
+        Returns:
+            dict: {"text": ...} with the transcript on success, {"error": ...} otherwise.
+        """
+        timeout = timeout or self.whisper_timeout
+        deadline = time.monotonic() + timeout
+
+        # In-memory audio is wrapped in a WAV header without touching the disk
+        if isinstance(audio, (bytes, bytearray)):
+            audio = self.create_wav_buffer(audio, sample_rate or self.sample_rate)
+
+        if self.whisper_worker is not None:
+            result = self.whisper_worker.transcribe(audio, timeout)
+            if "error" not in result:
+                return result
+            if time.monotonic() >= deadline:
+                return result
+            print(f"[-] {result['error']} Falling back to the whisper.cpp CLI.")
+
+        if isinstance(audio, bytes):
+            # The CLI reads a path, so the WAV is handed over through an anonymous in-memory file
+            fd = os.memfd_create("voice_command")
+            try:
+                with open(fd, "wb", closefd=False) as memory_file:
+                    memory_file.write(audio)
+                return self.run_whisper_cpp(f"/dev/fd/{fd}", deadline, cancel_event, pass_fds=(fd,))
+            finally:
+                os.close(fd)
+
+        return self.run_whisper_cpp(audio, deadline, cancel_event)
+
+    def run_whisper_cpp(self, filename, deadline, cancel_event=None, pass_fds=()):
+        """
+        Run the whisper.cpp CLI on an audio file, killing it if the deadline passes or the recognition is cancelled.
+
+        Args:
+            filename (str): The path to the WAV file.
+            deadline (float): The `time.monotonic()` value after which the CLI is killed.
+            cancel_event (threading.Event, optional): When set, the CLI is killed (default is None).
+            pass_fds (tuple, optional): File descriptors inherited by the CLI (default is an empty tuple).
+
+        Returns:
+            dict: {"text": ...} with the transcript on success, {"error": ...} otherwise.
+        """
         command = self.whisper_cpp_path
         arguments = ["-m", self.whisper_cpp_model_path, "-f", filename, "-l", "en","-nt"]
 
-        # Run the executable with the specified arguments
-        result = subprocess.run([command] + arguments, capture_output=True, text=True)      
+        # Run the executable with the specified arguments, polling so that a timeout or a cancellation kills it.
+        # It runs in its own process group so that a wrapper script is killed together with whisper.cpp.
+        try:
+            process = subprocess.Popen([command] + arguments, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, start_new_session=True, pass_fds=pass_fds)
+        except OSError as e:
+            return {"error": f"Failed to start whisper.cpp: {e}"}
+
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                if cancelled or time.monotonic() >= deadline:
+                    os.killpg(process.pid, signal.SIGKILL)
+                    process.communicate()
+                    if cancelled:
+                        return {"error": "Transcription with whisper.cpp was cancelled."}
+                    return {"error": "Transcription with whisper.cpp exceeded the timeout."}
 
-        if result.returncode == 0:
-            result = result.stdout.replace('\n', ' ').strip()
+        if process.returncode == 0:
+            result = stdout.replace('\n', ' ').strip()
             return {"text": result}
         else:
-            print("Error:\n", result.stderr)
-            return {"error": result.stderr}
-    
+            print("Error:\n", stderr)
+            return {"error": stderr}
+
+    def create_wav_buffer(self, pcm, sample_rate):
+        """
+        Wrap raw PCM audio in a WAV header in memory.
+
+        Args:
+            pcm (bytes): Raw mono 16-bit PCM audio.
+            sample_rate (int): The sample rate of the audio in Hz.
+
+        Returns:
+            bytes: The content of a WAV file holding the audio.
+        """
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(pcm)
+        return buffer.getvalue()
+
+    def recognize_using_race(self, uuid, filename, wf):
+        """
+        Recognize speech from an audio file by running whisper.cpp and Vosk concurrently. The whisper transcript is
+        preferred if it is available before the whisper timeout, otherwise whisper is cancelled and the Vosk
+        transcript is used, so the latency is bounded by the timeout rather than by whisper followed by Vosk.
+
+        Args:
+            uuid (str): The unique identifier (UUID) for the session.
+            filename (str): The path to the audio file.
+            wf (wave.Wave_read): The open WAV file, read by Vosk.
+
+        Returns:
+            str: The recognized text or error messages.
+        """
+        whisper_cancel = threading.Event()
+        vosk_cancel = threading.Event()
+        whisper_future = self.executor.submit(self.recognize_using_whisper_cpp, filename, self.whisper_timeout, whisper_cancel)
+        vosk_future = self.executor.submit(self.recognize_from_stream, uuid, self.read_audio_chunks(wf), vosk_cancel)
+
+        try:
+            result = whisper_future.result(timeout=self.whisper_timeout)
+        except FutureTimeoutError:
+            result = {"error": "Transcription with whisper.cpp exceeded the timeout."}
+        except Exception as e:
+            # any whisper failure falls back to the Vosk transcript
+            result = {"error": f"Transcription with whisper.cpp failed: {e}"}
+        finally:
+            whisper_cancel.set()
+
+        if 'error' not in result:
+            # Vosk is stopped, but waited for as the caller releases its recognizer afterwards
+            vosk_cancel.set()
+            vosk_future.result()
+            return result.get('text', '')
+
+        print(result['error'])
+        return vosk_future.result()
 
     def recognize_from_file(self, uuid, filename,stt_framework="vosk"):
         """
@@ -141,7 +617,7 @@ class STTModel:
         Args:
             uuid (str): The unique identifier (UUID) for the session.
             filename (str): The path to the audio file.
-            stt_model (str): The STT model to use for recognition (default is "vosk").
+            stt_framework (str): The STT framework to use for recognition (default is "vosk").
 
         Returns:
             str: The recognized text or error messages.
@@ -150,55 +626,58 @@ class STTModel:
             print(f"Audio file '{filename}' not found.")
             return "FILE_NOT_FOUND"
         
-        wf = wave.open(filename, "rb")
-        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getcomptype() != "NONE":
-            print("Audio file must be WAV format mono PCM.")
-            return "FILE_FORMAT_INVALID"
-        
-        # audio_data = wf.readframes(wf.getnframes())
-        # we need to perform chunking as target AGL system can't handle an entire audio file
-        audio_data = b""
-        while True:
-            chunk = wf.readframes(self.chunk_size)
-            if not chunk:
-                break  # End of file reached
-            audio_data += chunk
+        with wave.open(filename, "rb") as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getcomptype() != "NONE":
+                print("Audio file must be WAV format mono PCM.")
+                return "FILE_FORMAT_INVALID"
+
+            if wf.getnframes() == 0:
+                print("Voice not recognized. Please speak again...")
+                return "VOICE_NOT_RECOGNIZED"
 
-        if audio_data:
             # Perform speech recognition using the specified STT model
-            if stt_framework == "vosk":
-                if self.init_recognition(uuid, audio_data):
-                    result = self.recognize_using_vosk(uuid)
-                    return result['text']
-                else:
-                    result = self.recognize_using_vosk(uuid, partial=True)
-                    return result['partial']
-                
-            elif stt_framework == "whisper":
+            if stt_framework == "whisper" and self.whisper_strategy == "race":
+                return self.recognize_using_race(uuid, filename, wf)
+
+            if stt_framework == "whisper":
                 result = self.recognize_using_whisper_cpp(filename)
-                if 'error' in result:
-                    print(result['error'])
-                    # If Whisper times out, fall back to Vosk
-                    if self.init_recognition(uuid, audio_data):
-                        result = self.recognize_using_vosk(uuid)
-                        return result['text']
-                    else:
-                        result = self.recognize_using_vosk(uuid, partial=True)
-                        return result['partial']
-                else:
+                if 'error' not in result:
                     return result.get('text', '')
 
-        else:
-            print("Voice not recognized. Please speak again...")
-            return "VOICE_NOT_RECOGNIZED"
+                # If Whisper fails, fall back to Vosk
+                print(result['error'])
+
+            return self.recognize_from_stream(uuid, self.read_audio_chunks(wf))
+
+    def read_audio_chunks(self, wf):
+        """
+        Read an open WAV file in chunks of `chunk_size` frames. Chunks are handed to the caller one at a time, so only
+        a single chunk is held in memory regardless of the length of the recording.
+
+        Args:
+            wf (wave.Wave_read): The open WAV file to read.
+
+        Yields:
+            bytes: Raw PCM audio chunks.
+        """
+        # we need to perform chunking as target AGL system can't handle an entire audio file
+        while True:
+            chunk = wf.readframes(self.chunk_size)
+            if not chunk:
+                break  # End of file reached
+            yield chunk
     
 
     def cleanup_recognizer(self, uuid):
         """
-        Clean up and remove the Vosk recognizer for a session.
+        Clean up the Vosk recognizer for a session and return it to the recognizer pool.
 
         Args:
             uuid (str): The unique identifier (UUID) for the session.
         """
-        del self.recognizer[uuid]
+        with self.recognizer_lock:
+            recognizer = self.recognizer.pop(uuid)
+            sample_rate, grammar = self.recognizer_params.pop(uuid)
+            self.transcripts.pop(uuid, None)
+        self.recognizer_pool.release(recognizer, sample_rate, grammar)
     
\ No newline at end of file
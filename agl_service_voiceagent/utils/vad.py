@@ -0,0 +1,169 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import numpy as np
+
+
+def get_rms_db(audio_data):
+    """
+    Compute the RMS level of raw 16-bit PCM audio in dB relative to full scale (dBFS).
+
+    Args:
+        audio_data (bytes-like): Raw 16-bit PCM audio. A trailing incomplete sample is ignored, so chunks of any
+            length can be passed (e.g. audio streamed by a client).
+
+    Returns:
+        float: The RMS level in dBFS, -inf for digital silence.
+    """
+    audio_data = memoryview(audio_data).cast("B")
+    samples = np.frombuffer(audio_data[:len(audio_data) - len(audio_data) % 2], dtype=np.int16)
+    if samples.size == 0:
+        return -math.inf
+    rms = math.sqrt(np.mean(np.square(samples, dtype=np.float64))) / 32768
+    if rms == 0:
+        return -math.inf
+    return 20 * math.log10(rms)
+
+
+class EnergyVAD:
+    """
+    EnergyVAD is a lightweight energy based voice activity detector. Audio is considered speech when its RMS level is
+    above a threshold, and stays speech for a hangover period after the level drops so that trailing phonemes and the
+    silence needed for endpointing are not cut off.
+    """
+
+    def __init__(self, threshold_db=-45, hangover_ms=300):
+        """
+        Initialize the EnergyVAD instance with the provided parameters.
+
+        Args:
+            threshold_db (float, optional): The RMS level in dBFS above which audio is considered speech (default is -45).
+            hangover_ms (int, optional): The number of milliseconds audio is still considered speech after the level
+                drops below the threshold (default is 300).
+        """
+        self.threshold_db = threshold_db
+        self.hangover_ms = hangover_ms
+        self.hangover_left_ms = 0
+
+    def is_speech(self, audio_data, duration_ms):
+        """
+        Check whether an audio frame contains speech.
+
+        Args:
+            audio_data (bytes-like): Raw 16-bit PCM audio.
+            duration_ms (float): The duration of the audio frame in milliseconds.
+
+        Returns:
+            bool: True if the frame is considered speech, False otherwise.
+        """
+        return self.update(get_rms_db(audio_data) > self.threshold_db, duration_ms)
+
+    def update(self, above_threshold, duration_ms):
+        """
+        Update the detector state with the outcome of an externally computed level check.
+
+        Args:
+            above_threshold (bool): Whether the level of the frame is above the threshold.
+            duration_ms (float): The duration of the audio frame in milliseconds.
+
+        Returns:
+            bool: True if the frame is considered speech, False otherwise.
+        """
+        if above_threshold:
+            self.hangover_left_ms = self.hangover_ms
+            return True
+
+        if self.hangover_left_ms > 0:
+            self.hangover_left_ms -= duration_ms
+            return True
+
+        return False
+
+    def reset(self):
+        """
+        Reset the detector state.
+        """
+        self.hangover_left_ms = 0
+
+
+class VADEndpointer:
+    """
+    VADEndpointer decides when a voice command recording should end. The recording ends once speech has been followed
+    by enough silence, when no speech starts within a timeout, or when the maximum recording duration is reached.
+    """
+
+    def __init__(self, threshold_db=-45, silence_ms=800, no_speech_timeout_ms=5000, max_duration_ms=10000):
+        """
+        Initialize the VADEndpointer instance with the provided parameters.
+
+        Args:
+            threshold_db (float, optional): The RMS level in dBFS above which audio is considered speech (default is -45).
+            silence_ms (int, optional): The amount of silence in milliseconds that ends the command (default is 800).
+            no_speech_timeout_ms (int, optional): The number of milliseconds to wait for speech to start before giving
+                up (default is 5000).
+            max_duration_ms (int, optional): The maximum duration of a recording in milliseconds (default is 10000).
+        """
+        self.threshold_db = threshold_db
+        self.silence_ms = silence_ms
+        self.no_speech_timeout_ms = no_speech_timeout_ms
+        self.max_duration_ms = max_duration_ms
+        self.reset()
+
+    def process(self, audio_data, duration_ms):
+        """
+        Update the endpointer with a frame of raw 16-bit PCM audio.
+
+        Args:
+            audio_data (bytes-like): Raw 16-bit PCM audio.
+            duration_ms (float): The duration of the audio frame in milliseconds.
+
+        Returns:
+            bool: True if the recording should end, False otherwise.
+        """
+        return self.update(get_rms_db(audio_data), duration_ms)
+
+    def update(self, level_db, duration_ms):
+        """
+        Update the endpointer with the level of the latest audio frame.
+
+        Args:
+            level_db (float): The RMS level of the frame in dBFS.
+            duration_ms (float): The duration of the audio frame in milliseconds.
+
+        Returns:
+            bool: True if the recording should end, False otherwise.
+        """
+        self.elapsed_ms += duration_ms
+        if level_db > self.threshold_db:
+            self.speech_detected = True
+            self.silence_elapsed_ms = 0
+        else:
+            self.silence_elapsed_ms += duration_ms
+
+        if self.speech_detected and self.silence_elapsed_ms >= self.silence_ms:
+            return True
+        if not self.speech_detected and self.elapsed_ms >= self.no_speech_timeout_ms:
+            return True
+        return self.elapsed_ms >= self.max_duration_ms
+
+    def reset(self):
+        """
+        Reset the endpointer state for a new recording.
+        """
+        self.elapsed_ms = 0
+        self.silence_elapsed_ms = 0
+        self.speech_detected = False
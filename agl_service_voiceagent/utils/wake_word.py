@@ -15,8 +15,10 @@
 # limitations under the License.
 
 import gi
+import threading
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst, GLib
+from agl_service_voiceagent.utils.ring_buffer import AudioRingBuffer
 
 Gst.init(None)
 GLib.threads_init()
@@ -26,7 +28,7 @@ class WakeWordDetector:
     WakeWordDetector is a class for detecting a wake word in an audio stream using GStreamer and Vosk.
     """
 
-    def __init__(self, wake_word, stt_model, channels=1, sample_rate=16000, bits_per_sample=16):
+    def __init__(self, wake_word, stt_model, channels=1, sample_rate=16000, bits_per_sample=16, detection_mode="endpoint", hop_size_ms=200, grammar_mode=False, vad=None, capture_pipeline=None, capture_handoff=False):
         """
         Initialize the WakeWordDetector instance with the provided parameters.
 
@@ -36,19 +38,66 @@ class WakeWordDetector:
             channels (int, optional): The number of audio channels (default is 1).
             sample_rate (int, optional): The audio sample rate in Hz (default is 16000).
             bits_per_sample (int, optional): The number of bits per sample (default is 16).
+            detection_mode (str, optional): 'endpoint' to only check the results at utterance endpoints, or 'partial' to
+                also check the partial results after every hop (default is 'endpoint').
+            hop_size_ms (int, optional): The amount of audio in milliseconds decoded between two partial result checks
+                in 'partial' mode. Smaller hops detect the wake word sooner at the cost of more CPU (default is 200).
+            grammar_mode (bool, optional): If True, restrict the recognizer to the wake word and "[unk]" instead of
+                decoding against the full vocabulary of the model (default is False).
+            vad (EnergyVAD, optional): A voice activity detector gating the recognizer, so the decoder only runs while
+                there is speech (default is None, decode everything).
+            capture_pipeline (CapturePipeline, optional): A shared, pre-warmed capture pipeline to listen to instead of
+                building a new pipeline for this detector (default is None).
+            capture_handoff (bool, optional): If True, the subscription to the shared capture pipeline is handed over
+                at the end of the wake word instead of being closed, see `get_handoff_subscription` (default is False).
+
+        Raises:
+            ValueError: If the hop size doesn't hold any audio in 'partial' mode.
         """
+        bytes_per_second = sample_rate * channels * bits_per_sample // 8
+        if detection_mode == "partial" and int(bytes_per_second * hop_size_ms / 1000) <= 0:
+            raise ValueError(f"Invalid wake word hop size: {hop_size_ms} ms")
+
         self.loop = GLib.MainLoop()
         self.pipeline = None
         self.bus = None
         self.wake_word = wake_word
         self.wake_word_detected = False
+        self.detection_event = threading.Event()
+        self.stopped = False
+        self.stop_requested = False
         self.sample_rate = sample_rate
         self.channels = channels
         self.bits_per_sample = bits_per_sample
         self.wake_word_model = stt_model # Speech to text model recognizer
-        self.recognizer_uuid = stt_model.setup_vosk_recognizer()
-        self.audio_buffer = bytearray()
-        self.segment_size = int(self.sample_rate * 1.0)  # Adjust the segment size (e.g., 1 second)
+        grammar = [self.wake_word, "[unk]"] if grammar_mode else None
+        self.recognizer_uuid = stt_model.setup_vosk_recognizer(sample_rate, grammar)
+        self.vad = vad
+        self.detection_mode = detection_mode
+        if self.detection_mode == "partial":
+            self.segment_size = int(bytes_per_second * hop_size_ms / 1000)
+        else:
+            self.segment_size = int(bytes_per_second * 1.0)  # Adjust the segment size (e.g., 1 second)
+        # Audio is staged in a fixed-size ring buffer and segments are copied into a single reusable buffer, so
+        # continuous listening doesn't allocate new buffers for every incoming chunk
+        self.audio_buffer = AudioRingBuffer(self.segment_size * 4)
+        self.segment = bytearray(self.segment_size)
+        self.segment_view = memoryview(self.segment)
+        self.segment_duration_ms = self.segment_size * 1000 / bytes_per_second
+        # The last segment rejected by the VAD is kept, so the onset of the wake word isn't lost when speech starts
+        self.gated_segment = bytearray(self.segment_size)
+        self.has_gated_segment = False
+        self.capture_pipeline = capture_pipeline
+        self.subscription = None
+        self.capture_handoff = capture_handoff
+        self.handoff_subscription = None
+        # Number of bytes fed to the detector, used to locate the end of the wake word in the audio stream
+        self.audio_position = 0
+        self.detection_position = None
+        # The audio following the wake word that was taken out of the buffer without being processed, and the part of
+        # the last fed chunk that wasn't added to the buffer
+        self.unprocessed_segment = b""
+        self.unbuffered_audio = b""
      
     
     def get_wake_word_status(self):
@@ -60,10 +109,61 @@ class WakeWordDetector:
         """
         return self.wake_word_detected
 
+    def get_detection_position(self):
+        """
+        Get the position in the audio stream where the wake word was detected. With a shared capture pipeline, this is
+        a capture position of the pipeline, so recording the command can start exactly where the wake word ended.
+
+        Returns:
+            int: The position in bytes, or None if the wake word hasn't been detected.
+        """
+        return self.detection_position
+
+    def get_remaining_audio(self):
+        """
+        Get the audio fed to the detector that follows the wake word and hasn't been processed. The detector must not
+        be fed anymore, the audio is taken out of its buffer.
+
+        Returns:
+            bytes: Raw PCM audio, starting at the detection position.
+        """
+        remaining = bytearray(len(self.audio_buffer))
+        self.audio_buffer.read_into(remaining)
+        return self.unprocessed_segment + bytes(remaining) + self.unbuffered_audio
+
+    def get_handoff_subscription(self):
+        """
+        Get the subscription to the shared capture pipeline that starts where the wake word ended, when the detector
+        was created with `capture_handoff`. The caller owns the subscription and must unsubscribe it.
+
+        Returns:
+            CaptureSubscription: The subscription, or None if the wake word hasn't been detected.
+        """
+        return self.handoff_subscription
+
+    def wait_for_wake_word(self, timeout=None):
+        """
+        Block until the wake word is detected, listening stops or the timeout expires.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait (default is None, wait indefinitely).
+
+        Returns:
+            bool: True if the wake word has been detected, False otherwise.
+        """
+        self.detection_event.wait(timeout)
+        return self.wake_word_detected
+
     def create_pipeline(self):
         """
-        Create and configure the GStreamer audio processing pipeline for wake word detection.
+        Create and configure the GStreamer audio processing pipeline for wake word detection. With a shared capture
+        pipeline, the detector subscribes to it instead.
         """
+        if self.capture_pipeline is not None:
+            # Only the audio captured from now on matters for the wake word
+            self.subscription = self.capture_pipeline.subscribe()
+            return
+
         print("Creating pipeline for Wake Word Detection...")
         self.pipeline = Gst.Pipeline()
         autoaudiosrc = Gst.ElementFactory.make("autoaudiosrc", None)
@@ -113,27 +213,66 @@ class WakeWordDetector:
         """
         sample = appsink.emit("pull-sample")
         buffer = sample.get_buffer()
-        data = buffer.extract_dup(0, buffer.get_size())
 
-        # Add the new data to the buffer
-        self.audio_buffer.extend(data)
+        # Map the buffer memory instead of duplicating it, it is copied straight into the ring buffer
+        success, map_info = buffer.map(Gst.MapFlags.READ)
+        if success:
+            try:
+                self.feed_audio(map_info.data)
+            finally:
+                buffer.unmap(map_info)
 
-        # Process audio in segments
-        while len(self.audio_buffer) >= self.segment_size:
-            segment = self.audio_buffer[:self.segment_size]
-            self.process_audio_segment(segment)
+        return Gst.FlowReturn.OK
 
-            # Advance the buffer by the segment size
-            self.audio_buffer = self.audio_buffer[self.segment_size:]
+    def feed_audio(self, data):
+        """
+        Add raw PCM audio to the detection buffer and process it in segments. This is used by the GStreamer appsink
+        callback, and can also be called directly with audio coming from elsewhere (e.g. a gRPC client stream).
 
-        return Gst.FlowReturn.OK
+        Args:
+            data (bytes-like): Raw mono 16-bit PCM audio.
+
+        Returns:
+            bool: True if the wake word has been detected, False otherwise.
+        """
+        data = memoryview(data).cast("B")
+        offset = 0
+        while offset < len(data) and not self.wake_word_detected:
+            # Add as much of the new data to the buffer as fits
+            written = self.audio_buffer.write(data[offset:])
+            offset += written
+            self.audio_position += written
+
+            # Process audio in segments
+            while len(self.audio_buffer) >= self.segment_size and not self.wake_word_detected:
+                self.audio_buffer.read_into(self.segment_view)
+                if self.vad is not None and not self.vad.is_speech(self.segment_view, self.segment_duration_ms):
+                    # Skip decoding silence, but keep the segment around in case speech starts in the next one
+                    self.segment, self.gated_segment = self.gated_segment, self.segment
+                    self.segment_view = memoryview(self.segment)
+                    self.has_gated_segment = True
+                    continue
+
+                if self.has_gated_segment:
+                    self.has_gated_segment = False
+                    self.process_audio_segment(self.gated_segment)
+                    if self.wake_word_detected:
+                        # The wake word ended in the replayed segment, the segment just read comes after it
+                        self.detection_position -= self.segment_size
+                        self.unprocessed_segment = bytes(self.segment_view)
+                        break
+                self.process_audio_segment(self.segment_view)
+
+        if self.wake_word_detected:
+            self.unbuffered_audio = bytes(data[offset:])
+        return self.wake_word_detected
 
     def process_audio_segment(self, segment):
         """
         Process an audio segment for wake word detection.
 
         Args:
-            segment (bytes): The audio segment to process.
+            segment (bytes-like): The audio segment to process.
         """
         # Process the audio data segment
         audio_data = bytes(segment)
@@ -142,23 +281,53 @@ class WakeWordDetector:
         if self.wake_word_model.init_recognition(self.recognizer_uuid, audio_data):
             stt_result = self.wake_word_model.recognize_using_vosk(self.recognizer_uuid)
             print("STT Result: ", stt_result)
-            if self.wake_word in stt_result["text"]:
-                self.wake_word_detected = True
-                print("Wake word detected!")
+            text = stt_result["text"]
+        elif self.detection_mode == "partial":
+            # Catch the wake word mid-utterance instead of waiting for the endpoint
+            text = self.wake_word_model.recognize_using_vosk(self.recognizer_uuid, partial=True)["partial"]
+        else:
+            text = ""
+
+        if self.wake_word in text:
+            # The wake word ends with the segment just processed, the audio still buffered comes after it
+            self.detection_position = self.audio_position - len(self.audio_buffer)
+            if self.subscription is not None:
+                self.detection_position += self.subscription.start_position
+            self.wake_word_detected = True
+            self.detection_event.set()
+            print("Wake word detected!")
+            if self.pipeline is not None:
                 self.pipeline.send_event(Gst.Event.new_eos())
 
     def send_eos(self):
         """
-        Send an End-of-Stream (EOS) event to the pipeline.
+        Send an End-of-Stream (EOS) event to the pipeline. This can be called from any thread, it only signals the
+        listening thread to stop, which releases the detector's resources.
         """
-        self.pipeline.send_event(Gst.Event.new_eos())
-        self.audio_buffer.clear()
+        self.stop_requested = True
+        pipeline = self.pipeline
+        if pipeline is not None:
+            pipeline.send_event(Gst.Event.new_eos())
+        if self.subscription is not None:
+            self.capture_pipeline.unsubscribe(self.subscription)
 
 
     def start_listening(self):
         """
         Start listening for the wake word and enter the event loop.
         """
+        if self.subscription is not None:
+            print("Listening for Wake Word...")
+            for chunk in self.subscription.get_audio_chunks():
+                if self.stop_requested:
+                    break
+                if self.feed_audio(chunk):
+                    if self.capture_handoff:
+                        self.handoff_subscription = self.capture_pipeline.hand_over(self.subscription, self.detection_position, self.get_remaining_audio())
+                    break
+            self.stop_listening()
+            return
+
         self.pipeline.set_state(Gst.State.PLAYING)
         print("Listening for Wake Word...")
         self.loop.run()
@@ -170,6 +339,10 @@ class WakeWordDetector:
         """
         self.cleanup_pipeline()
         self.loop.quit()
+        # The buffer isn't thread-safe, it is only touched by the listening thread
+        self.audio_buffer.clear()
+        self.stopped = True
+        self.detection_event.set()
 
 
     def on_bus_message(self, bus, message):
@@ -210,4 +383,14 @@ class WakeWordDetector:
             print("Pipeline cleanup complete!")
             self.bus = None
             self.pipeline = None
+        if self.subscription is not None:
+            self.capture_pipeline.unsubscribe(self.subscription)
+        self.cleanup_recognizer()
+
+    def cleanup_recognizer(self):
+        """
+        Release the Vosk recognizer used for wake word detection.
+        """
+        if self.recognizer_uuid is not None:
             self.wake_word_model.cleanup_recognizer(self.recognizer_uuid)
+            self.recognizer_uuid = None
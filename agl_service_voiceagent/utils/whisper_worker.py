@@ -0,0 +1,243 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+import requests
+import threading
+import subprocess
+
+
+class WhisperCppWorker:
+    """
+    WhisperCppWorker manages a long-lived whisper.cpp server process. The ggml model is loaded once when the worker
+    starts, and transcription jobs are sent to it over a local HTTP connection instead of spawning the whisper.cpp CLI
+    (and reloading the model) for every utterance. The worker is health checked periodically and restarted with backoff
+    if it dies or stops answering, and restarted when a job exceeds its timeout so later jobs don't queue behind it.
+    """
+
+    def __init__(self, server_path, model_path, port, host="127.0.0.1", job_timeout=10, startup_timeout=30, health_check_interval=5,
+                 max_restarts=5):
+        """
+        Initialize the WhisperCppWorker instance with the provided parameters.
+
+        Args:
+            server_path (str): The path to the whisper.cpp server executable.
+            model_path (str): The path to the whisper.cpp ggml model.
+            port (int): The port the worker listens on.
+            host (str, optional): The address the worker listens on (default is "127.0.0.1").
+            job_timeout (float, optional): The maximum number of seconds a transcription job may take (default is 10).
+            startup_timeout (float, optional): The maximum number of seconds to wait for the worker to load the model
+                (default is 30).
+            health_check_interval (float, optional): The number of seconds between two health checks (default is 5).
+            max_restarts (int, optional): The number of consecutive failed restarts after which the worker is given up,
+                the delay between restarts doubles after every failure (default is 5).
+        """
+        self.server_path = server_path
+        self.model_path = model_path
+        self.host = host
+        self.port = port
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+        self.health_check_interval = health_check_interval
+        self.base_url = f"http://{host}:{port}"
+        self.process = None
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.monitor_thread = None
+        self.ready = False
+        self.max_restarts = max_restarts
+        self.failed_restarts = 0
+        self.active_jobs = 0
+        self.jobs_lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the worker process, wait for it to load the model and start the health monitor.
+
+        Returns:
+            bool: True if the worker is ready to accept jobs, False otherwise.
+        """
+        with self.lock:
+            started = self.start_process()
+
+        # without the server executable there is nothing to restart
+        if self.monitor_thread is None and os.path.exists(self.server_path):
+            self.monitor_thread = threading.Thread(target=self.monitor, daemon=True)
+            self.monitor_thread.start()
+        return started
+
+    def start_process(self):
+        """
+        Spawn the worker process and wait until it answers requests. Must be called with the lock held.
+        """
+        if not os.path.exists(self.server_path):
+            print(f"[-] Error: whisper.cpp server not found at '{self.server_path}'.")
+            return False
+
+        command = [
+            self.server_path,
+            "-m", self.model_path,
+            "--host", self.host,
+            "--port", str(self.port),
+            "-l", "en",
+            "-nt"
+        ]
+        self.process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                print(f"[-] Error: whisper.cpp worker exited during startup with code {self.process.returncode}.")
+                self.process = None
+                self.ready = False
+                return False
+            if self.is_healthy():
+                self.ready = True
+                print(f"whisper.cpp worker ready at {self.base_url}.")
+                return True
+            time.sleep(0.1)
+
+        print("[-] Error: whisper.cpp worker did not become ready in time.")
+        self.stop_process()
+        return False
+
+    def is_healthy(self):
+        """
+        Check whether the worker process is alive and answering requests.
+
+        Returns:
+            bool: True if the worker is healthy, False otherwise.
+        """
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            response = self.session.get(self.base_url, timeout=1)
+            return response.status_code < 500
+        except requests.RequestException:
+            return False
+
+    def monitor(self):
+        """
+        Periodically check the health of the worker and restart it if it crashed or stopped answering. Failed restarts
+        are retried with exponential backoff, the worker is given up after `max_restarts` consecutive failures.
+        """
+        next_check = self.health_check_interval
+        while not self.stop_event.wait(next_check):
+            next_check = self.health_check_interval
+            # a worker busy with a job may not answer health checks, hung jobs are handled by the job timeout
+            with self.jobs_lock:
+                busy = self.active_jobs > 0
+            if busy or self.is_healthy():
+                self.failed_restarts = 0
+                continue
+
+            print("[-] whisper.cpp worker is not healthy, restarting it...")
+            with self.lock:
+                self.stop_process()
+                if self.start_process():
+                    self.failed_restarts = 0
+                    continue
+
+            self.failed_restarts += 1
+            if self.failed_restarts >= self.max_restarts:
+                print(f"[-] Error: whisper.cpp worker failed to restart {self.failed_restarts} times, giving up.")
+                return
+            next_check = self.health_check_interval * 2 ** self.failed_restarts
+
+    def restart(self, process):
+        """
+        Restart the worker, unless it was already restarted since the given process was running.
+
+        Args:
+            process (subprocess.Popen): The worker process to replace.
+        """
+        with self.lock:
+            if self.process is not process or self.stop_event.is_set():
+                return
+            self.stop_process()
+            self.start_process()
+
+    def transcribe(self, audio, timeout=None):
+        """
+        Transcribe a WAV recording using the worker.
+
+        Args:
+            audio (str or bytes): The path to a WAV file, or the content of a WAV file held in memory.
+            timeout (float, optional): The maximum number of seconds to wait for the result (default is the job timeout).
+
+        Returns:
+            dict: {"text": ...} with the transcript on success, {"error": ...} otherwise.
+        """
+        if not self.ready:
+            return {"error": "whisper.cpp worker is not ready."}
+
+        data = {"response_format": "json", "temperature": "0.0"}
+        process = self.process
+        with self.jobs_lock:
+            self.active_jobs += 1
+        try:
+            if isinstance(audio, (bytes, bytearray)):
+                files = {"file": ("audio.wav", bytes(audio), "audio/wav")}
+                response = self.session.post(f"{self.base_url}/inference", files=files, data=data, timeout=timeout or self.job_timeout)
+            else:
+                with open(audio, "rb") as audio_file:
+                    files = {"file": (os.path.basename(audio), audio_file, "audio/wav")}
+                    response = self.session.post(f"{self.base_url}/inference", files=files, data=data, timeout=timeout or self.job_timeout)
+
+        except requests.Timeout:
+            # the server handles one job at a time, restart it so that later jobs don't queue behind the stuck one
+            self.ready = False
+            threading.Thread(target=self.restart, args=(process,), daemon=True).start()
+            return {"error": "Transcription with the whisper.cpp worker exceeded the timeout."}
+
+        except (requests.RequestException, OSError) as e:
+            return {"error": f"Transcription with the whisper.cpp worker failed: {e}"}
+
+        finally:
+            with self.jobs_lock:
+                self.active_jobs -= 1
+
+        if response.status_code != 200:
+            return {"error": f"whisper.cpp worker returned status {response.status_code}: {response.text}"}
+
+        try:
+            text = response.json().get("text", "")
+        except (ValueError, AttributeError) as e:
+            return {"error": f"whisper.cpp worker returned an invalid response: {e}"}
+        return {"text": text.replace('\n', ' ').strip()}
+
+    def stop_process(self):
+        """
+        Terminate the worker process. Must be called with the lock held.
+        """
+        self.ready = False
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+    def stop(self):
+        """
+        Stop the health monitor and terminate the worker process.
+        """
+        self.stop_event.set()
+        with self.lock:
+            self.stop_process()
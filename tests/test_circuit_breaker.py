@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from agl_service_voiceagent.utils import circuit_breaker
+from agl_service_voiceagent.utils.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+def open_circuit(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_half_open_lets_a_single_trial_call_through(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    open_circuit(breaker)
+    clock.now += 9.9
+    assert not breaker.allow_request()
+
+    clock.now += 0.1
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # concurrent callers fail fast while the trial call is in flight
+    assert not breaker.allow_request()
+
+
+def test_successful_trial_call_closes_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    open_circuit(breaker)
+    clock.now += 10
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    # the failure count starts over
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_call_reopens_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    open_circuit(breaker)
+    clock.now += 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    # the reset timeout starts again from the failed trial call
+    clock.now += 9.9
+    assert not breaker.allow_request()
+    clock.now += 0.1
+    assert breaker.allow_request()
@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+
+import pytest
+
+from agl_service_voiceagent.utils.component_registry import ComponentRegistry, Component
+
+
+class FlakyLoader:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("server is down")
+        return "instance"
+
+
+def make_registry(**kwargs):
+    registry = ComponentRegistry(**kwargs)
+    registry.logger = logging.getLogger("test_component_registry")
+    return registry
+
+
+def test_failed_lazy_component_is_retried_after_backoff():
+    registry = make_registry(retry_interval=0.05, max_retry_interval=1)
+    loader = FlakyLoader(failures=2)
+    registry.register("media", loader, lazy=True)
+
+    with pytest.raises(RuntimeError, match="server is down"):
+        registry.get("media")
+    # still backing off, the loader isn't called again
+    with pytest.raises(RuntimeError):
+        registry.get("media")
+    assert loader.calls == 1
+
+    time.sleep(0.06)
+    with pytest.raises(RuntimeError):
+        registry.get("media")
+    assert loader.calls == 2
+
+    # the backoff doubles after every consecutive failure
+    time.sleep(0.06)
+    with pytest.raises(RuntimeError):
+        registry.get("media")
+    assert loader.calls == 2
+
+    time.sleep(0.05)
+    assert registry.get("media") == "instance"
+    assert registry.is_ready("media")
+    assert loader.calls == 3
+
+
+def test_failed_eager_component_is_not_retried():
+    registry = make_registry(retry_interval=0)
+    loader = FlakyLoader(failures=1)
+    registry.register("model", loader)
+    registry.load("model")
+
+    with pytest.raises(RuntimeError):
+        registry.get("model")
+    assert loader.calls == 1
+    assert registry.components["model"].state == Component.FAILED
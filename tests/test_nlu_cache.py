@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from agl_service_voiceagent.nlu import nlu_cache
+from agl_service_voiceagent.nlu.nlu_cache import NLUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(nlu_cache, "time", clock)
+    return clock
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = NLUCache(max_size=2)
+    cache.put("model", "a", {"intent": "A"})
+    cache.put("model", "b", {"intent": "B"})
+    # reading "a" makes "b" the least recently used entry
+    assert cache.get("model", "a") == {"intent": "A"}
+    cache.put("model", "c", {"intent": "C"})
+
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") == {"intent": "A"}
+    assert cache.get("model", "c") == {"intent": "C"}
+    assert cache.get_stats() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = NLUCache(max_size=4, ttl=10)
+    cache.put("model", "a", {"intent": "A"})
+    clock.now += 10
+    assert cache.get("model", "a") == {"intent": "A"}
+    clock.now += 0.5
+    assert cache.get("model", "a") is None
+    assert cache.get_stats()["size"] == 0
+
+    # putting a result again restarts its time to live
+    cache.put("model", "a", {"intent": "A"})
+    clock.now += 5
+    assert cache.get("model", "a") == {"intent": "A"}
+
+
+def test_zero_ttl_never_expires(clock):
+    cache = NLUCache(max_size=4, ttl=0)
+    cache.put("model", "a", {"intent": "A"})
+    clock.now += 1e9
+    assert cache.get("model", "a") == {"intent": "A"}
+
+
+def test_cache_is_cleared_when_the_model_changes(clock):
+    cache = NLUCache(max_size=4)
+    cache.put("model-1", "a", {"intent": "A"})
+    assert cache.get("model-2", "a") is None
+    assert cache.get("model-1", "a") is None
+
+
+def test_zero_size_disables_the_cache(clock):
+    cache = NLUCache(max_size=0)
+    cache.put("model", "a", {"intent": "A"})
+    assert cache.get("model", "a") is None
@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from agl_service_voiceagent.utils.ring_buffer import AudioRingBuffer
+
+
+def test_write_is_limited_by_free_space():
+    ring = AudioRingBuffer(8)
+    assert ring.write(b"0123456789") == 8
+    assert len(ring) == 8
+    assert ring.get_free_space() == 0
+    assert ring.write(b"x") == 0
+
+
+def test_read_and_write_wrap_around():
+    ring = AudioRingBuffer(8)
+    out = bytearray(5)
+    ring.write(b"abcdef")
+    assert ring.read_into(out) == 5
+    assert out == b"abcde"
+
+    # the write starts at position 6 and wraps around the end of the storage
+    assert ring.write(b"ghijklm") == 7
+    assert len(ring) == 8
+    out = bytearray(8)
+    assert ring.read_into(out) == 8
+    assert out == b"fghijklm"
+    assert len(ring) == 0
+
+
+def test_read_into_partial_buffer_and_memoryview():
+    ring = AudioRingBuffer(4)
+    ring.write(b"ab")
+    out = bytearray(b"....")
+    assert ring.read_into(memoryview(out)[1:]) == 2
+    assert out == b".ab."
+    assert ring.read_into(out) == 0
+
+
+def test_clear():
+    ring = AudioRingBuffer(4)
+    ring.write(b"abc")
+    ring.clear()
+    assert len(ring) == 0
+    ring.write(b"wxyz")
+    out = bytearray(4)
+    ring.read_into(out)
+    assert out == b"wxyz"
@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agl_service_voiceagent.nlu.speculative_nlu import SpeculativeNLU
+
+
+class RecordingExtractor:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, text):
+        with self.lock:
+            self.calls.append(text)
+        return {"text": text}
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_matching_final_transcript_reuses_speculative_result(executor):
+    extract = RecordingExtractor()
+    speculative_nlu = SpeculativeNLU(extract, executor, stability_ms=10)
+    speculative_nlu.update("Turn up the volume")
+    wait_for(lambda: extract.calls)
+
+    result, hit = speculative_nlu.get_result("turn up the volume!")
+    assert hit
+    assert result == {"text": "turn up the volume"}
+    assert extract.calls == ["turn up the volume"]
+
+
+def test_stale_partial_transcript_is_not_extracted(executor):
+    extract = RecordingExtractor()
+    speculative_nlu = SpeculativeNLU(extract, executor, stability_ms=50)
+    speculative_nlu.update("turn up")
+    speculative_nlu.update("turn up the volume")
+    wait_for(lambda: extract.calls)
+    time.sleep(0.1)
+    assert extract.calls == ["turn up the volume"]
+
+    # a final transcript matching no speculation is extracted inline
+    result, hit = speculative_nlu.get_result("turn up")
+    assert not hit
+    assert result == {"text": "turn up"}
+
+
+def test_unstable_transcript_is_never_speculated(executor):
+    extract = RecordingExtractor()
+    speculative_nlu = SpeculativeNLU(extract, executor, stability_ms=1000)
+    speculative_nlu.update("turn up")
+    result, hit = speculative_nlu.get_result("turn up")
+    assert not hit
+    time.sleep(0.05)
+    assert extract.calls == ["turn up"]
+
+
+def test_queued_speculation_is_not_waited_for(executor):
+    # another request keeps the only worker busy, so the speculation stays queued
+    release = threading.Event()
+    executor.submit(release.wait)
+    extract = RecordingExtractor()
+    speculative_nlu = SpeculativeNLU(extract, executor, stability_ms=10)
+    speculative_nlu.update("turn up the volume")
+    wait_for(lambda: speculative_nlu.results)
+
+    start = time.monotonic()
+    result, hit = speculative_nlu.get_result("turn up the volume")
+    assert time.monotonic() - start < 0.5
+    assert not hit
+    assert result == {"text": "turn up the volume"}
+
+    release.set()
+    executor.shutdown(wait=True)
+    # the queued speculation was cancelled instead of running after the request
+    assert extract.calls == ["turn up the volume"]
+
+
+def test_running_speculation_is_waited_for(executor):
+    started = threading.Event()
+    release = threading.Event()
+
+    def extract(text):
+        started.set()
+        release.wait()
+        return {"text": text}
+
+    speculative_nlu = SpeculativeNLU(extract, executor, stability_ms=10)
+    speculative_nlu.update("turn up the volume")
+    assert started.wait(2)
+    threading.Timer(0.05, release.set).start()
+    result, hit = speculative_nlu.get_result("turn up the volume")
+    assert hit
+    assert result == {"text": "turn up the volume"}
@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (c) 2023 Malik Talha
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import struct
+
+from agl_service_voiceagent.utils.vad import get_rms_db, EnergyVAD, VADEndpointer
+
+
+def pcm(*samples):
+    return struct.pack(f"<{len(samples)}h", *samples)
+
+
+def test_get_rms_db_ignores_trailing_odd_byte():
+    assert get_rms_db(b"\x00\x01\x02") == get_rms_db(b"\x00\x01")
+    assert get_rms_db(b"\x01") == -math.inf
+    assert get_rms_db(b"") == -math.inf
+
+
+def test_energy_vad_hangover():
+    vad = EnergyVAD(threshold_db=-45, hangover_ms=50)
+    speech = pcm(*[8000] * 160)
+    silence = pcm(*[0] * 160)
+    assert not vad.is_speech(silence, 20)
+    assert vad.is_speech(speech, 20)
+    # silence is still speech for the 50 ms hangover, counted in whole frames
+    assert vad.is_speech(silence, 20)
+    assert vad.is_speech(silence, 20)
+    assert vad.is_speech(silence, 20)
+    assert not vad.is_speech(silence, 20)
+    # speech restarts the hangover
+    assert vad.is_speech(speech, 20)
+    assert vad.is_speech(silence, 20)
+    vad.reset()
+    assert not vad.is_speech(silence, 20)
+
+
+def test_energy_vad_accepts_odd_length_frames():
+    vad = EnergyVAD(threshold_db=-45, hangover_ms=0)
+    assert vad.is_speech(pcm(*[8000] * 160) + b"\x7f", 10)
+    assert not vad.is_speech(b"\x00\x00\x00", 10)
+
+
+def test_endpointer_accepts_odd_length_chunks():
+    endpointer = VADEndpointer(threshold_db=-45, silence_ms=20, no_speech_timeout_ms=1000, max_duration_ms=10000)
+    speech = pcm(*[8000] * 160)
+    silence = pcm(*[0] * 160)
+    assert not endpointer.process(speech + b"\x7f", 10)
+    assert not endpointer.process(silence[:-1], 10)
+    assert endpointer.process(silence + b"\x00", 10)